@@ -51,6 +51,7 @@ INSTALLED_APPS = DJANGO_APPS + LOCAL_APPS + THIRD_PARTY_APPS
 
 
 MIDDLEWARE = [
+    'tasks.middleware.QueryTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
 
     'django.middleware.locale.LocaleMiddleware',
@@ -96,6 +97,90 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/2.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'todo-api',
+    }
+}
+
+PROJECT_LIST_CACHE_TIMEOUT = 60 * 15
+
+# Projects with more tasks than this are deleted in batches of this size by a
+# delete_project job (tasks.deletion, tasks.jobs); smaller ones right away.
+PROJECT_DELETE_BATCH_SIZE = 1000
+
+
+# Background jobs (tasks.jobs, run by `manage.py run_workers`)
+# A running job not finished or renewed within JOB_VISIBILITY_TIMEOUT seconds
+# is handed to another worker; failures are retried after JOB_RETRY_DELAY
+# seconds, doubled per attempt. At most JOB_USER_CONCURRENCY jobs of one user
+# run at once.
+
+JOB_VISIBILITY_TIMEOUT = 60 * 5
+JOB_RETRY_DELAY = 10
+JOB_USER_CONCURRENCY = 2
+
+
+# Sessions and messages
+# DJANGO_SESSION_PROFILE picks the session backend:
+#   db             - a django_session read on every request (Django's default)
+#   cached_db      - read from the cache, written through to the database; the
+#                    cache must be shared by all processes (check users.E001)
+#   signed_cookies - no server-side storage; signed, not encrypted, with SECRET_KEY
+# Messages live in their own cookie so a success message doesn't make the
+# session dirty and force a session write.
+
+SESSION_PROFILES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}
+
+SESSION_ENGINE = SESSION_PROFILES[os.environ.get('DJANGO_SESSION_PROFILE', 'db')]
+
+MESSAGE_STORAGE = 'django.contrib.messages.storage.cookie.CookieStorage'
+
+# With users.middleware.CachedAuthenticationMiddleware in place of Django's
+# AuthenticationMiddleware (settings.production) request.user is cached for
+# this many seconds and dropped whenever the User is saved, deleted or
+# updated through UserQuerySet.update(). The cache must be shared by all
+# processes (check users.E002).
+AUTH_USER_CACHE_TIMEOUT = 60 * 5
+
+
+# SQL instrumentation
+# Share of requests (0..1) whose query count and DB time are reported in
+# Server-Timing headers and on the tasks.query_timing logger. 0 disables it.
+
+QUERY_TIMING_SAMPLE_RATE = float(os.environ.get('DJANGO_QUERY_TIMING_SAMPLE_RATE', 0))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'tasks.query_timing': {'handlers': ['console'], 'level': 'INFO', 'propagate': False},
+        'tasks.jobs': {'handlers': ['console'], 'level': 'INFO', 'propagate': False},
+    },
+}
+
+
+# Login throttling (users.throttling)
+# Failed logins allowed per IP / per email within the sliding window (seconds)
+# before that IP / email is locked out for LOGIN_THROTTLE_LOCKOUT seconds.
+
+LOGIN_THROTTLE_WINDOW = 60 * 5
+LOGIN_THROTTLE_IP_LIMIT = 20
+LOGIN_THROTTLE_EMAIL_LIMIT = 5
+LOGIN_THROTTLE_LOCKOUT = 60 * 15
+
+
 # Password validation
 # https://docs.djangoproject.com/en/2.2/ref/settings/#auth-password-validators
 
@@ -0,0 +1,115 @@
+"""
+Production settings for todo_api project.
+
+Select with DJANGO_SETTINGS_MODULE=settings.production; everything not
+overridden here comes from settings.base.
+"""
+
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+from .base import *  # noqa: F401,F403
+from .base import BASE_DIR, MIDDLEWARE, SESSION_PROFILES
+
+
+# the key in settings.base is committed, so there is no fallback to it
+try:
+    SECRET_KEY = os.environ['DJANGO_SECRET_KEY']
+except KeyError:
+    raise ImproperlyConfigured('Set the DJANGO_SECRET_KEY environment variable.')
+
+DEBUG = False
+
+ALLOWED_HOSTS = [host for host in os.environ.get('DJANGO_ALLOWED_HOSTS', '').split(',') if host]
+
+
+def env_flag(name, default=False):
+    return os.environ.get(name, str(default)).lower() in ('1', 'true', 'yes', 'on')
+
+
+# Database
+# Connections are kept open for CONN_MAX_AGE seconds instead of being opened
+# and torn down on every request. CONN_HEALTH_CHECKS is handled by
+# tasks.signals.check_connections on Django 2.2, which only pings connections
+# idle for more than CONN_HEALTH_CHECK_IDLE seconds. Server-side cursors (used by
+# .iterator(), e.g. the task export) must be disabled behind a pgbouncer in
+# transaction pooling mode.
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': os.environ.get('POSTGRES_DB', 'todo_api'),
+        'USER': os.environ.get('POSTGRES_USER', 'todo_api'),
+        'PASSWORD': os.environ.get('POSTGRES_PASSWORD', ''),
+        'HOST': os.environ.get('POSTGRES_HOST', 'localhost'),
+        'PORT': os.environ.get('POSTGRES_PORT', '5432'),
+        'CONN_MAX_AGE': int(os.environ.get('DJANGO_CONN_MAX_AGE', 600)),
+        'CONN_HEALTH_CHECKS': env_flag('DJANGO_CONN_HEALTH_CHECKS', True),
+        'CONN_HEALTH_CHECK_IDLE': int(os.environ.get('DJANGO_CONN_HEALTH_CHECK_IDLE', 30)),
+        'DISABLE_SERVER_SIDE_CURSORS': env_flag('DJANGO_DISABLE_SERVER_SIDE_CURSORS'),
+        'OPTIONS': {
+            'connect_timeout': int(os.environ.get('POSTGRES_CONNECT_TIMEOUT', 5)),
+            'options': '-c statement_timeout={}'.format(os.environ.get('POSTGRES_STATEMENT_TIMEOUT', '30s')),
+        },
+    }
+}
+
+
+# Cache
+# Shared by every process: login throttling (users.throttling), cached_db
+# sessions and the cached request.user (users.middleware) all need each worker
+# to see the same entries, which a per-process LocMemCache doesn't give. The
+# DatabaseCache default needs `manage.py createcachetable`; for Memcached set
+# DJANGO_CACHE_BACKEND=django.core.cache.backends.memcached.PyLibMCCache (with
+# pylibmc installed) and DJANGO_CACHE_LOCATION=host:port.
+
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('DJANGO_CACHE_BACKEND', 'django.core.cache.backends.db.DatabaseCache'),
+        'LOCATION': os.environ.get('DJANGO_CACHE_LOCATION', 'todo_api_cache'),
+    }
+}
+
+
+# Sessions
+# With the shared cache above, sessions are read from the cache instead of
+# the django_session table.
+
+SESSION_ENGINE = SESSION_PROFILES[os.environ.get('DJANGO_SESSION_PROFILE', 'cached_db')]
+
+
+# Authentication
+# request.user is read from the shared cache above (users.middleware).
+
+MIDDLEWARE = [
+    'users.middleware.CachedAuthenticationMiddleware'
+    if name == 'django.contrib.auth.middleware.AuthenticationMiddleware' else name
+    for name in MIDDLEWARE
+]
+
+
+# Templates
+# Compiled templates are kept in memory for the life of the process instead
+# of being read and parsed from disk on every render.
+
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [os.path.join(BASE_DIR, 'templates')],
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.debug',
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+            ],
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
+        },
+    },
+]
@@ -1,19 +1,65 @@
 from django.contrib import admin
 from .models import Project, Task
+from .pagination import EstimatedCountPaginator
+
+
+class InputFilter(admin.SimpleListFilter):
+    """A list filter with a text box, for columns with too many values to list."""
+    template = 'admin/input_filter.html'
+
+    def lookups(self, request, model_admin):
+        return ()
+
+    def has_output(self):
+        return True
+
+    def choices(self, changelist):
+        all_choice = next(super(InputFilter, self).choices(changelist))
+        all_choice['query_parts'] = [(key, value) for key, value in changelist.get_filters_params().items()
+                                     if key != self.parameter_name]
+        yield all_choice
+
+
+class UserEmailFilter(InputFilter):
+    # an exact match on the unique email: the user list filter ran a DISTINCT
+    # over every project and rendered one link per user
+    title = 'user email'
+    parameter_name = 'user_email'
+    field = 'user'
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(**{f'{self.field}__email': self.value().strip()})
+        return queryset
+
+
+class OwnerEmailFilter(UserEmailFilter):
+    title = 'owner email'
+    parameter_name = 'owner_email'
+    field = 'owner'
+
 
 @admin.register(Project)
 class ProjectAdmin(admin.ModelAdmin):
     list_display = ('title','user',)
-    list_filter = ['title', 'user']
+    list_filter = [UserEmailFilter]
+    list_select_related = ['user']
+    search_fields = ['title']
+    autocomplete_fields = ['user']
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
     prepopulated_fields = {'slug': ('title',)}
 
 
 @admin.register(Task)
 class TaskAdmin(admin.ModelAdmin):
     list_display = ['title','project', 'user', 'priority', 'status', 'created']
-    list_filter = ['created', 'priority', 'status']
+    list_filter = ['created', 'priority', 'status', OwnerEmailFilter]
     list_editable = ['priority', 'status']
-    date_hierarchy = 'created'
+    list_select_related = ['project__user', 'owner']
+    autocomplete_fields = ['project']
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
 
     prepopulated_fields = {'slug': ('title',)}
 
@@ -24,4 +70,4 @@ class TaskAdmin(admin.ModelAdmin):
     ]
 
     def user(self, obj):
-        return obj.project.user
\ No newline at end of file
+        return obj.owner
@@ -0,0 +1,237 @@
+import json
+
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.db import IntegrityError
+from django.db.models import F
+from django.http import JsonResponse
+from django.utils import timezone
+from django.views.generic import View
+
+from .forms import ProjectCreateForm, ProjectUpdateForm, TaskForm
+from .models import Project, Task
+from .pagination import InvalidCursor, KeysetPaginator
+
+
+PROJECT_FIELDS = ('id', 'title', 'slug', 'color')
+TASK_FIELDS = ('id', 'title', 'slug', 'description', 'priority', 'status', 'created', 'modified')
+
+
+class BadRequest(Exception):
+    pass
+
+
+def serialize_project(project):
+    return {field: getattr(project, field) for field in PROJECT_FIELDS}
+
+
+def serialize_task(task):
+    data = {field: getattr(task, field) for field in TASK_FIELDS}
+    data['project_slug'] = task.project.slug
+    return data
+
+
+def task_values(queryset):
+    return queryset.values(*TASK_FIELDS, project_slug=F('project__slug'))
+
+
+class ApiView(LoginRequiredMixin, View):
+    """
+    Base for the JSON endpoints. Lists are serialized straight from
+    ``.values()`` so no model instances are built for them.
+    """
+    paginate_by = 50
+    keyset_ordering = ('id',)
+
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            return super(ApiView, self).dispatch(request, *args, **kwargs)
+        except BadRequest as exc:
+            return JsonResponse({'error': str(exc)}, status=400)
+
+    def handle_no_permission(self):
+        return JsonResponse({'error': 'Authentication required.'}, status=401)
+
+    def http_method_not_allowed(self, request, *args, **kwargs):
+        return JsonResponse({'error': 'Method not allowed.'}, status=405)
+
+    def get_data(self):
+        try:
+            data = json.loads(self.request.body.decode() or '{}')
+        except ValueError:
+            raise BadRequest('Invalid JSON.')
+        if not isinstance(data, dict):
+            raise BadRequest('Expected a JSON object.')
+        return data
+
+    def paginate(self, queryset):
+        paginator = KeysetPaginator(queryset, self.keyset_ordering, self.paginate_by)
+        try:
+            page = paginator.page(self.request.GET.get('cursor'))
+        except InvalidCursor:
+            raise BadRequest('Invalid cursor.')
+        return JsonResponse({
+            'results': page.object_list,
+            'next': page.next_cursor,
+            'previous': page.previous_cursor,
+        })
+
+    def form_errors(self, form):
+        return JsonResponse({'errors': form.errors}, status=400)
+
+
+class ProjectApiListView(ApiView):
+    keyset_ordering = ('title', 'id')
+
+    def get(self, request, *args, **kwargs):
+        return self.paginate(Project.objects.visible().filter(user=request.user).values(*PROJECT_FIELDS))
+
+    def post(self, request, *args, **kwargs):
+        form = ProjectCreateForm(data=self.get_data(), user=request.user)
+        if not form.is_valid():
+            return self.form_errors(form)
+        form.instance.user = request.user
+        try:
+            project = form.save()
+        except IntegrityError:
+            if not form.errors:
+                raise
+            return self.form_errors(form)
+        return JsonResponse(serialize_project(project), status=201)
+
+
+class ProjectApiDetailView(ApiView):
+
+    def get_queryset(self):
+        return Project.objects.visible().filter(user=self.request.user, slug=self.kwargs['slug'])
+
+    def get(self, request, *args, **kwargs):
+        data = self.get_queryset().values(*PROJECT_FIELDS).first()
+        if data is None:
+            return JsonResponse({'error': 'Not found.'}, status=404)
+        return JsonResponse(data)
+
+    def put(self, request, *args, **kwargs):
+        project = self.get_queryset().first()
+        if project is None:
+            return JsonResponse({'error': 'Not found.'}, status=404)
+        data = serialize_project(project)
+        data.update(self.get_data())
+        form = ProjectUpdateForm(data=data, instance=project, user=request.user)
+        if not form.is_valid():
+            return self.form_errors(form)
+        try:
+            project = form.save()
+        except IntegrityError:
+            if not form.errors:
+                raise
+            return self.form_errors(form)
+        return JsonResponse(serialize_project(project))
+
+    patch = put
+
+
+class TaskApiListView(ApiView):
+    keyset_ordering = ('created', 'id')
+
+    def get(self, request, *args, **kwargs):
+        return self.paginate(task_values(Task.objects.for_user(request.user)))
+
+    def post(self, request, *args, **kwargs):
+        data = {'priority': Task.HIGN, 'status': Task.UNCOMPLETED}
+        data.update(self.get_data())
+        form = TaskForm(data=data, user=request.user)
+        if not form.is_valid():
+            return self.form_errors(form)
+        return JsonResponse(serialize_task(form.save()), status=201)
+
+
+class TaskApiDetailView(ApiView):
+
+    def get_queryset(self):
+        return Task.objects.for_user(self.request.user).filter(slug=self.kwargs['slug'])
+
+    def get(self, request, *args, **kwargs):
+        data = task_values(self.get_queryset()).first()
+        if data is None:
+            return JsonResponse({'error': 'Not found.'}, status=404)
+        return JsonResponse(data)
+
+    def put(self, request, *args, **kwargs):
+        task = self.get_queryset().select_related('project').first()
+        if task is None:
+            return JsonResponse({'error': 'Not found.'}, status=404)
+        data = serialize_task(task)
+        data['project'] = data.pop('project_slug')
+        data.update(self.get_data())
+        form = TaskForm(data=data, instance=task, user=request.user)
+        if not form.is_valid():
+            return self.form_errors(form)
+        return JsonResponse(serialize_task(form.save()))
+
+    patch = put
+
+
+class TaskApiBulkView(ApiView):
+    """
+    ``POST {"action": ..., "ids": [...]}`` or ``{"action": ..., "filter": {...}}``
+    applies one action to the user's matching tasks with a single ``UPDATE``
+    or ``DELETE``. Actions: ``complete``, ``reprioritize`` (``priority``),
+    ``move`` (``project`` slug) and ``delete``. Rows that already have the
+    requested value aren't touched, so their ``modified`` stays as it is.
+    """
+    max_ids = 1000
+    actions = ('complete', 'reprioritize', 'move', 'delete')
+
+    def post(self, request, *args, **kwargs):
+        data = self.get_data()
+        action = data.get('action')
+        if action not in self.actions:
+            raise BadRequest('action must be one of: {}.'.format(', '.join(self.actions)))
+        tasks = self.get_tasks(data)
+
+        if action == 'delete':
+            return JsonResponse({'action': action, 'deleted': tasks.bulk_delete()})
+        if action == 'complete':
+            changes = {'status': Task.COMPLETED}
+        elif action == 'reprioritize':
+            changes = {'priority': self.get_choice(data, 'priority', Task.PRIORITY)}
+        else:
+            if not isinstance(data.get('project'), str):
+                raise BadRequest('project must be a project slug.')
+            try:
+                changes = {'project': Project.objects.visible().get(user=request.user, slug=data['project'])}
+            except Project.DoesNotExist:
+                raise BadRequest('Unknown project.')
+        updated = tasks.exclude(**changes).update(modified=timezone.now(), **changes)
+        return JsonResponse({'action': action, 'updated': updated})
+
+    def get_tasks(self, data):
+        tasks = Task.objects.for_user(self.request.user)
+        if 'ids' in data:
+            ids = data['ids']
+            if not isinstance(ids, list) or not all(isinstance(pk, int) and not isinstance(pk, bool) for pk in ids):
+                raise BadRequest('ids must be a list of task ids.')
+            if len(ids) > self.max_ids:
+                raise BadRequest(f'At most {self.max_ids} ids, use a filter for more.')
+            return tasks.filter(pk__in=ids)
+        if 'filter' in data:
+            filters = data['filter']
+            if not isinstance(filters, dict) or set(filters) - {'project', 'status', 'priority'}:
+                raise BadRequest('filter accepts project, status and priority.')
+            if 'project' in filters:
+                if not isinstance(filters['project'], str):
+                    raise BadRequest('filter project must be a project slug.')
+                tasks = tasks.filter(project__slug=filters['project'])
+            if 'status' in filters:
+                tasks = tasks.filter(status=self.get_choice(filters, 'status', Task.STATUS))
+            if 'priority' in filters:
+                tasks = tasks.filter(priority=self.get_choice(filters, 'priority', Task.PRIORITY))
+            return tasks
+        raise BadRequest('Pass ids or filter.')
+
+    def get_choice(self, data, name, choices):
+        value = data.get(name)
+        # JSON true/false would pass as 1/0
+        if not isinstance(value, int) or isinstance(value, bool) or value not in dict(choices):
+            raise BadRequest(f'Invalid {name}.')
+        return value
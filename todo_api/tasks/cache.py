@@ -0,0 +1,113 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from django.utils.translation import get_language
+
+
+PROJECT_LIST_TIMEOUT = getattr(settings, 'PROJECT_LIST_CACHE_TIMEOUT', 60 * 15)
+
+HITS_KEY = 'projects:stats:hits'
+MISSES_KEY = 'projects:stats:misses'
+
+
+def _incr(key):
+    try:
+        return cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, None)
+        return cache.incr(key)
+
+
+def _version_key(user_id):
+    return f'projects:version:{user_id}'
+
+
+def _initial_version():
+    # Time based, so a counter lost to eviction restarts above every version
+    # handed out before and can't bring old entries back.
+    return int(time.time() * 1000)
+
+
+def get_project_list_version(user_id):
+    key = _version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _initial_version(), None)
+        version = cache.get(key)
+    return version
+
+
+def bump_project_list_version(user_id):
+    key = _version_key(user_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _initial_version(), None)
+
+
+def cached_project_list(user_id, variant, build):
+    """
+    Return the cached value for ``user_id``'s project list (``variant`` tells
+    pages apart), calling ``build`` on a miss. Entries of older versions are
+    never read again and simply expire.
+    """
+    digest = hashlib.md5(variant.encode()).hexdigest()
+    key = f'projects:list:{user_id}:{get_project_list_version(user_id)}:{digest}'
+    value = cache.get(key)
+    if value is not None:
+        _incr(HITS_KEY)
+        return value
+    _incr(MISSES_KEY)
+    value = build()
+    cache.set(key, value, PROJECT_LIST_TIMEOUT)
+    return value
+
+
+def project_list_stats():
+    hits = cache.get(HITS_KEY, 0)
+    misses = cache.get(MISSES_KEY, 0)
+    total = hits + misses
+    return {'hits': hits, 'misses': misses, 'hit_ratio': hits / total if total else None}
+
+
+class ConditionalGetMixin:
+    """
+    Answer a GET with ``304 Not Modified`` while the client's ``ETag`` still
+    matches, before the queryset is built or the template rendered.
+
+    ``get_change_stamp`` returns a cheap value that changes whenever the page
+    would, and the time of the last change or None. Read it from the
+    database: the cache may be per process (``LocMemCache``) and miss the
+    changes made by workers and other web processes. The ETag also covers the
+    user and the name the header shows, the language and the query string
+    (the cursor). Only the ETag is validated: a deleted row doesn't move the
+    last change time, so ``If-Modified-Since`` alone could answer 304 for a
+    changed page.
+    """
+
+    def get_change_stamp(self):
+        raise NotImplementedError
+
+    def get(self, request, *args, **kwargs):
+        get = super(ConditionalGetMixin, self).get
+        if get_messages(request):
+            # a 304 would leave the message for the next page
+            return get(request, *args, **kwargs)
+        stamp, last_modified = self.get_change_stamp()
+        # str(user) is the name base.html shows in the header
+        variant = repr((stamp, request.user.pk, str(request.user), get_language(), request.GET.urlencode()))
+        etag = quote_etag(hashlib.md5(variant.encode()).hexdigest())
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = get(request, *args, **kwargs)
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified.timestamp())
+        # the page is per user and has to be revalidated on every use
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
@@ -0,0 +1,20 @@
+from django.core import checks
+from django.db import connections
+
+from .search import missing_objects
+
+
+@checks.register(checks.Tags.database)
+def check_search_index(app_configs=None, **kwargs):
+    """The full-text index of tasks.search; only run with ``check --tag database``."""
+    errors = []
+    for alias in connections:
+        missing = missing_objects(connections[alias])
+        if missing:
+            errors.append(checks.Error(
+                f'The task search index is incomplete in the {alias!r} database, missing: {", ".join(missing)}.',
+                hint='A migration rebuilt tasks_task without creating the search triggers again, '
+                     'see tasks.search.',
+                id='tasks.E001',
+            ))
+    return errors
@@ -0,0 +1,76 @@
+"""
+Project deletion in bounded batches.
+
+``Project.delete()`` goes through Django's ``Collector``, which loads every
+task of the project and deletes them all in one transaction. Instead
+``schedule_deletion`` only flags the project (hiding it and its tasks
+everywhere but the project list, which shows the progress) and
+``purge_project`` removes the tasks ``batch_size`` at a time, each batch in
+its own short transaction, before deleting the project row itself.
+
+Small projects are purged right away by the delete view; for the rest it
+enqueues a ``delete_project`` job (``tasks.jobs``). ``manage.py
+purge_projects`` purges whatever is still flagged.
+"""
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .cache import bump_project_list_version
+from .models import Project, Task
+
+
+def _batch_size():
+    return getattr(settings, 'PROJECT_DELETE_BATCH_SIZE', 1000)
+
+
+def schedule_deletion(project):
+    # the slug is dropped so the project's URLs 404 and its slug is free again
+    Project.objects.filter(pk=project.pk).update(deleting=True, slug=None, modified=timezone.now())
+    project.deleting, project.slug = True, None
+    bump_project_list_version(project.user_id)
+
+
+def delete_batch(project, batch_size=None):
+    """Delete up to ``batch_size`` of the project's tasks; return how many went."""
+    batch_size = batch_size or _batch_size()
+    pks = list(Task.objects.filter(project=project).order_by().values_list('pk', flat=True)[:batch_size])
+    if not pks:
+        return 0
+    tasks = Task.objects.filter(pk__in=pks, project=project)
+    # _raw_delete (private, as in TaskQuerySet.bulk_delete) issues the bare
+    # DELETE: delete() would have the Collector load the batch and send
+    # post_delete for every task, each an UPDATE of the project's counters.
+    # Nothing points at tasks, the search index follows by trigger, and the
+    # counters are adjusted by what the DELETEs report, cheaper than
+    # bulk_delete's recount of the project's remaining tasks every batch.
+    with transaction.atomic():
+        completed = tasks.filter(status=Task.COMPLETED)._raw_delete(tasks.db)
+        rows = completed + tasks._raw_delete(tasks.db)
+        Project.objects.filter(pk=project.pk).adjust_counts(-rows, -completed)
+    bump_project_list_version(project.user_id)
+    return rows
+
+
+def purge_project(project, batch_size=None, pause=0, progress=None):
+    """
+    Delete the project's tasks batch by batch, then the project. ``pause``
+    seconds between batches leave room for other writers (SQLite has a single
+    write lock); ``progress`` is called with the running total after each
+    batch. Return the number of deleted tasks.
+    """
+    deleted = 0
+    while True:
+        rows = delete_batch(project, batch_size)
+        if not rows:
+            break
+        deleted += rows
+        if progress is not None:
+            progress(deleted)
+        if pause:
+            time.sleep(pause)
+    # nothing is left for the Collector to load
+    project.delete()
+    return deleted
@@ -0,0 +1,79 @@
+import csv
+import json
+import zlib
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import Task
+
+
+CSV = 'csv'
+NDJSON = 'ndjson'
+CONTENT_TYPES = {CSV: 'text/csv', NDJSON: 'application/x-ndjson'}
+
+# same column names the importer reads, so an export can be imported back
+FIELDS = ('id', 'project', 'title', 'description', 'priority', 'status', 'created', 'modified')
+COLUMNS = ('id', 'project__title', 'title', 'description', 'priority', 'status', 'created', 'modified')
+
+CHUNK_SIZE = 2000
+BUFFER_SIZE = 64 * 1024
+
+
+class Echo:
+    """File-like object for csv.writer that hands the formatted line back."""
+
+    def write(self, value):
+        return value
+
+
+def task_rows(user, chunk_size=CHUNK_SIZE):
+    # .iterator() streams through a server-side cursor on PostgreSQL and
+    # doesn't fill the queryset cache, so memory stays flat
+    return (Task.objects.for_user(user)
+            .order_by('id')
+            .values_list(*COLUMNS)
+            .iterator(chunk_size=chunk_size))
+
+
+def csv_lines(rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(FIELDS)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def ndjson_lines(rows):
+    encoder = DjangoJSONEncoder()
+    for row in rows:
+        yield encoder.encode(dict(zip(FIELDS, row))) + '\n'
+
+
+SERIALIZERS = {CSV: csv_lines, NDJSON: ndjson_lines}
+
+
+def encoded(lines, size=BUFFER_SIZE):
+    """Join small lines into ~``size`` byte chunks to keep the writes few."""
+    buffer, buffered = [], 0
+    for line in lines:
+        data = line.encode()
+        buffer.append(data)
+        buffered += len(data)
+        if buffered >= size:
+            yield b''.join(buffer)
+            buffer, buffered = [], 0
+    if buffer:
+        yield b''.join(buffer)
+
+
+def gzipped(chunks):
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_tasks(user, fmt, compress=False):
+    chunks = encoded(SERIALIZERS[fmt](task_rows(user)))
+    return gzipped(chunks) if compress else chunks
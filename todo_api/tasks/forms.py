@@ -1,8 +1,56 @@
 from django import forms
+from django.db import IntegrityError, transaction
+from django.db.models import Q
 
-from .models import Project
+from .importers import FORMATS
+from .models import Project, Task
 
-class ProjectCreateForm(forms.ModelForm):
+class ProjectUniqueMixin:
+    """
+    Title and color are unique per user (``Project.Meta.constraints``). Both
+    are checked with one query in ``clean``; a concurrent save that still
+    hits a constraint gets the same errors, see ``save``.
+    """
+    title_error = 'You cann\'t use this title again.'
+    color_error = 'You cann\'t use this color again.'
+
+    def clean(self):
+        cleaned_data = super(ProjectUniqueMixin, self).clean()
+        self.add_clash_errors()
+        return cleaned_data
+
+    def add_clash_errors(self):
+        title = self.cleaned_data.get('title')
+        color = self.cleaned_data.get('color')
+        user_id = self.instance.user_id if self.instance.pk else self.user.pk
+        clashes = Project.objects.visible().filter(Q(title=title) | Q(color=color), user_id=user_id)
+        if self.instance.pk:
+            clashes = clashes.exclude(pk=self.instance.pk)
+        found = False
+        for clash_title, clash_color in clashes.values_list('title', 'color'):
+            if clash_title == title and not self.has_error('title'):
+                self.add_error('title', self.title_error)
+            if clash_color == color and not self.has_error('color'):
+                self.add_error('color', self.color_error)
+            found = True
+        return found
+
+    def save(self, commit=True):
+        """
+        Raise ``IntegrityError`` with the clash added to the form errors when
+        another request saved the same title or color after ``clean``.
+        """
+        if not commit:
+            return super(ProjectUniqueMixin, self).save(commit)
+        try:
+            with transaction.atomic():
+                return super(ProjectUniqueMixin, self).save(commit)
+        except IntegrityError:
+            self.add_clash_errors()
+            raise
+
+
+class ProjectCreateForm(ProjectUniqueMixin, forms.ModelForm):
     title = forms.CharField(label='Project', widget=forms.TextInput())
 
     class Meta:
@@ -13,20 +61,8 @@ class ProjectCreateForm(forms.ModelForm):
         self.user = kwargs.pop('user', '')
         super(ProjectCreateForm, self).__init__(*args, **kwargs)
 
-    def clean_title(self):
-        title = self.cleaned_data['title']
-        if Project.objects.filter(title=title, user=self.user).exists():
-            raise forms.ValidationError('You cann\'t use this title again.')
-        return title
-
-    def clean_color(self):
-        color = self.cleaned_data['color']
-        if Project.objects.filter(color=color, user=self.user).exists():
-            raise forms.ValidationError('You cann\'t use this color again.')
-        return color
 
-
-class ProjectUpdateForm(forms.ModelForm):
+class ProjectUpdateForm(ProjectUniqueMixin, forms.ModelForm):
 
     title = forms.CharField()
     color = forms.CharField()
@@ -36,13 +72,28 @@ class ProjectUpdateForm(forms.ModelForm):
         fields = ['title', 'color']
 
     def __init__(self, *args, **kwargs):
-        self.slug = kwargs.pop('slug')
         self.user = kwargs.pop('user')
         super(ProjectUpdateForm, self).__init__(*args, **kwargs)
 
-    def clean(self):
-        title = self.cleaned_data['title']
-        color = self.cleaned_data['color']
+class TaskImportForm(forms.Form):
+    project = forms.ModelChoiceField(queryset=Project.objects.none())
+    file = forms.FileField(help_text='CSV with a header row or JSON lines; columns: title, description, priority, status.')
+    format = forms.ChoiceField(choices=(('', 'Guess from file name'),) + FORMATS, required=False)
 
-        if Project.objects.exclude(slug=self.slug).filter(title=title, user = self.user).exists():
-            raise forms.ValidationError('You cann\'t use this title again.')
\ No newline at end of file
+    def __init__(self, *args, **kwargs):
+        self.user = kwargs.pop('user')
+        super(TaskImportForm, self).__init__(*args, **kwargs)
+        self.fields['project'].queryset = Project.objects.visible().filter(user=self.user)
+
+
+class TaskForm(forms.ModelForm):
+    project = forms.ModelChoiceField(queryset=Project.objects.none(), to_field_name='slug')
+
+    class Meta:
+        model = Task
+        fields = ('project', 'title', 'description', 'priority', 'status')
+
+    def __init__(self, *args, **kwargs):
+        self.user = kwargs.pop('user')
+        super(TaskForm, self).__init__(*args, **kwargs)
+        self.fields['project'].queryset = Project.objects.visible().filter(user=self.user)
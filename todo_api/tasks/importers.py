@@ -0,0 +1,151 @@
+import csv
+import json
+import time
+from functools import reduce
+from itertools import islice
+from operator import or_
+
+from django.db import transaction
+from django.db.models import Q
+
+from .models import Task
+
+
+CSV = 'csv'
+JSONL = 'jsonl'
+FORMATS = ((CSV, 'CSV'), (JSONL, 'JSON lines'))
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+class TaskImportError(Exception):
+
+    def __init__(self, line, message):
+        self.line = line
+        self.message = message
+        super(TaskImportError, self).__init__(f'Line {line}: {message}')
+
+
+class ImportResult:
+
+    def __init__(self, rows, seconds):
+        self.rows = rows
+        self.seconds = seconds
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds else float(self.rows)
+
+
+def guess_format(filename):
+    return JSONL if filename.lower().endswith(('.jsonl', '.ndjson', '.json')) else CSV
+
+
+def read_rows(stream, fmt):
+    """Yield ``(line, row)`` pairs from a text stream without reading it whole."""
+    if fmt == CSV:
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+    elif fmt == JSONL:
+        for line, text in enumerate(stream, start=1):
+            if not text.strip():
+                continue
+            try:
+                row = json.loads(text)
+            except ValueError:
+                raise TaskImportError(line, 'Invalid JSON.')
+            if not isinstance(row, dict):
+                raise TaskImportError(line, 'Expected a JSON object.')
+            yield line, row
+    else:
+        raise ValueError(f'Unknown import format {fmt!r}.')
+
+
+def _choice(line, row, name, choices, default):
+    value = row.get(name)
+    if value in (None, ''):
+        return default
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        value = None
+    if value not in dict(choices):
+        raise TaskImportError(line, f'Invalid {name} {row.get(name)!r}.')
+    return value
+
+
+def _text(line, row, name):
+    # JSON rows can hold any type, CSV rows only strings
+    value = row.get(name)
+    if value is None:
+        return ''
+    if not isinstance(value, str):
+        raise TaskImportError(line, f'{name.capitalize()} must be a string.')
+    return value
+
+
+def build_task(line, row, project):
+    title = _text(line, row, 'title').strip()
+    if not title:
+        raise TaskImportError(line, 'Title is required.')
+    if len(title) > Task._meta.get_field('title').max_length:
+        raise TaskImportError(line, 'Title is too long.')
+    return Task(
+        project=project,
+        owner_id=project.user_id,
+        title=title,
+        description=_text(line, row, 'description'),
+        priority=_choice(line, row, 'priority', Task.PRIORITY, Task.HIGN),
+        status=_choice(line, row, 'status', Task.STATUS, Task.UNCOMPLETED),
+    )
+
+
+def assign_slugs(tasks, username):
+    """
+    Give every task the ``<title>-<username>`` slug ``Task.save`` would, with a
+    ``-<n>`` suffix where it is already taken. One query per batch plus one
+    per hundred clashing titles.
+    """
+    bases = [Task.slug_base(task.title, username) for task in tasks]
+    taken = set(Task.objects.filter(slug__in=set(bases)).values_list('slug', flat=True))
+
+    seen, clashes = set(), set()
+    for base in bases:
+        if base in taken or base in seen:
+            clashes.add(base)
+        seen.add(base)
+    clashes = list(clashes)
+    # chunked so a re-import doesn't hit SQLite's expression depth limit
+    for i in range(0, len(clashes), 100):
+        condition = reduce(or_, (Q(slug__startswith=f'{base}-') for base in clashes[i:i + 100]))
+        taken |= set(Task.objects.filter(condition).values_list('slug', flat=True))
+
+    for task, base in zip(tasks, bases):
+        slug, n = base, 1
+        while slug in taken:
+            n += 1
+            slug = f'{base}-{n}'
+        task.slug = slug
+        taken.add(slug)
+
+
+def import_tasks(rows, project, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Insert the tasks described by ``rows`` (see ``read_rows``) into ``project``
+    with one ``bulk_create`` and one transaction per batch. Batches written
+    before an invalid row stay committed.
+    """
+    username = project.user.username
+    started = time.monotonic()
+    imported = 0
+    rows = iter(rows)
+    while True:
+        batch = [build_task(line, row, project) for line, row in islice(rows, batch_size)]
+        if not batch:
+            break
+        assign_slugs(batch, username)
+        with transaction.atomic():
+            Task.objects.bulk_create(batch, batch_size=batch_size)
+        imported += len(batch)
+    return ImportResult(imported, time.monotonic() - started)
@@ -0,0 +1,188 @@
+"""
+A small job queue kept in the ``tasks_job`` table, so work that shouldn't
+block a request runs in ``manage.py run_workers`` without a broker, on SQLite
+as well as PostgreSQL.
+
+* ``enqueue(name, user=None, max_attempts=3, **payload)`` adds a job for
+  the handler registered with ``@register(name)``.
+* ``claim(worker)`` hands a job to one worker with a conditional ``UPDATE``
+  on ``attempts``: of several workers racing for the same job only one
+  matches.
+* A claimed job is leased for ``JOB_VISIBILITY_TIMEOUT`` seconds. If its
+  worker dies the job is claimed again once the lease runs out; long
+  handlers renew it with ``heartbeat`` and raise ``LeaseLost`` when that
+  fails, leaving the job to the worker that claimed it since.
+* A failing job is retried after ``JOB_RETRY_DELAY`` seconds, doubled on
+  every attempt, until ``max_attempts``.
+* At most ``JOB_USER_CONCURRENCY`` jobs of one user run at the same time.
+"""
+import json
+import logging
+import threading
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from .deletion import purge_project
+from .models import Job, Project
+
+
+logger = logging.getLogger(__name__)
+
+HANDLERS = {}
+
+# claims of the threads of one worker process go one at a time; across
+# processes the user row lock (PostgreSQL) or the database write lock
+# (SQLite) keeps the per-user limit, see _lock_user
+_claim_lock = threading.Lock()
+
+
+class LeaseLost(Exception):
+    pass
+
+
+def register(name):
+    def decorator(handler):
+        HANDLERS[name] = handler
+        return handler
+    return decorator
+
+
+def _visibility_timeout():
+    return timedelta(seconds=getattr(settings, 'JOB_VISIBILITY_TIMEOUT', 60 * 5))
+
+
+def _retry_delay(attempts):
+    return timedelta(seconds=getattr(settings, 'JOB_RETRY_DELAY', 10) * 2 ** (attempts - 1))
+
+
+def _user_concurrency():
+    return getattr(settings, 'JOB_USER_CONCURRENCY', 2)
+
+
+def enqueue(name, user=None, max_attempts=3, **payload):
+    if name not in HANDLERS:
+        raise ValueError(f'No job handler is registered as {name!r}.')
+    return Job.objects.create(name=name, user=user, max_attempts=max_attempts,
+                              payload=json.dumps(payload, cls=DjangoJSONEncoder))
+
+
+def _claimable(now):
+    return Q(status=Job.QUEUED, run_after__lte=now) | Q(status=Job.RUNNING, locked_until__lt=now)
+
+
+def _owned(job):
+    # a worker that overran its lease has lost the job to the next claim
+    return Job.objects.filter(pk=job.pk, status=Job.RUNNING, locked_by=job.locked_by, attempts=job.attempts)
+
+
+def _busy_users(now):
+    return (Job.objects.filter(status=Job.RUNNING, locked_until__gte=now, user__isnull=False)
+            .order_by().values('user').annotate(running=Count('pk'))
+            .filter(running__gte=_user_concurrency()).values('user'))
+
+
+def _lock_user(user_id):
+    # on PostgreSQL concurrent claims for one user wait for each other here,
+    # so the running count in the UPDATE below is current; SQLite has a
+    # single writer anyway, and a read before the UPDATE would only make it
+    # fail with "database is locked" when another connection is writing
+    if connection.features.has_select_for_update:
+        list(get_user_model().objects.select_for_update().filter(pk=user_id).values_list('pk'))
+
+
+def claim(worker, batch=20):
+    """Lease the next due job to ``worker`` and return it, or None."""
+    with _claim_lock:
+        now = timezone.now()
+        candidates = list(Job.objects.filter(_claimable(now)).order_by('run_after', 'pk')
+                          .values_list('pk', 'user_id', 'attempts', 'max_attempts')[:batch])
+        for pk, user_id, attempts, max_attempts in candidates:
+            unchanged = Job.objects.filter(_claimable(now), pk=pk, attempts=attempts)
+            if attempts >= max_attempts:
+                # the lease of its last attempt ran out
+                unchanged.update(status=Job.FAILED, locked_until=None, modified=now,
+                                 error='Visibility timeout expired.')
+                continue
+            with transaction.atomic():
+                if user_id is not None:
+                    _lock_user(user_id)
+                claimed = unchanged.exclude(user__in=_busy_users(now)).update(
+                    status=Job.RUNNING, attempts=F('attempts') + 1, locked_by=worker,
+                    locked_until=now + _visibility_timeout(), modified=now)
+            if claimed:
+                return Job.objects.get(pk=pk)
+    return None
+
+
+def heartbeat(job):
+    """Renew the lease; False means the job has been claimed by another worker."""
+    now = timezone.now()
+    return bool(_owned(job).update(locked_until=now + _visibility_timeout(), modified=now))
+
+
+def run(job):
+    """Run a claimed job and record the outcome; return True if it succeeded."""
+    try:
+        handler = HANDLERS[job.name]
+        handler(job, **json.loads(job.payload))
+    except LeaseLost:
+        # the job and its outcome belong to another worker now
+        logger.warning('Job %s lost its lease on attempt %s.', job, job.attempts)
+        return False
+    except Exception:
+        logger.exception('Job %s failed on attempt %s.', job, job.attempts)
+        now = timezone.now()
+        if job.attempts >= job.max_attempts or job.name not in HANDLERS:
+            _owned(job).update(status=Job.FAILED, locked_until=None, modified=now, error=traceback.format_exc())
+        else:
+            _owned(job).update(status=Job.QUEUED, locked_until=None, modified=now, error=traceback.format_exc(),
+                               run_after=now + _retry_delay(job.attempts))
+        return False
+    _owned(job).update(status=Job.DONE, locked_until=None, modified=timezone.now(), error='')
+    return True
+
+
+def work(worker, stop=None, once=False, poll_interval=1):
+    """
+    Claim and run jobs until ``stop`` is set or, with ``once``, nothing is
+    left to claim. Return the number of jobs run.
+    """
+    stop = stop or threading.Event()
+    count = 0
+    while not stop.is_set():
+        job = claim(worker)
+        if job is None:
+            if once:
+                break
+            stop.wait(poll_interval)
+            continue
+        run(job)
+        count += 1
+    return count
+
+
+@register('delete_project')
+def delete_project(job, project_id):
+    def progress(deleted):
+        if not heartbeat(job):
+            raise LeaseLost(f'Job {job.pk} was claimed by another worker after {deleted} tasks.')
+
+    project = Project.objects.filter(pk=project_id, deleting=True).first()
+    if project is not None:
+        purge_project(project, progress=progress)
+
+
+@register('recount_projects')
+def recount_projects(job, project_ids=None):
+    projects = Project.objects.all()
+    if project_ids is not None:
+        projects = projects.filter(pk__in=project_ids)
+    projects.recount()
+    projects.bump_list_versions()
@@ -0,0 +1,67 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.core.signals import request_finished, request_started
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.backends.signals import connection_created
+
+from .bench_templates import percentile
+
+
+class Command(BaseCommand):
+    help = ('Measure the database cost of a request cycle with a new connection per request '
+            '(CONN_MAX_AGE=0) and with a persistent one.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+        parser.add_argument('--max-age', type=int, default=600,
+                            help='CONN_MAX_AGE of the reuse profile.')
+
+    def handle(self, *args, **options):
+        conn = connections[options['database']]
+        self.stdout.write(f'{conn.vendor} {conn.settings_dict["NAME"]}, '
+                          f'{options["requests"]} requests per profile')
+        if conn.vendor == 'sqlite' and conn.is_in_memory_db():
+            self.stdout.write(self.style.WARNING('in-memory SQLite never closes its connection'))
+
+        original = conn.settings_dict['CONN_MAX_AGE']
+        try:
+            results = [(name, *self.measure(conn, max_age, options['requests']))
+                       for name, max_age in (('no reuse', 0), ('reuse', options['max_age']))]
+        finally:
+            conn.settings_dict['CONN_MAX_AGE'] = original
+            conn.close()
+
+        self.stdout.write(f'{"profile":<9} {"connects":>8} {"mean ms":>9} {"p50 ms":>9} {"p95 ms":>9}')
+        for name, connects, timings in results:
+            self.stdout.write('{:<9} {:>8} {:>9.3f} {:>9.3f} {:>9.3f}'.format(
+                name, connects, statistics.mean(timings), percentile(timings, 50), percentile(timings, 95)))
+        overhead = statistics.mean(results[0][2]) - statistics.mean(results[1][2])
+        self.stdout.write(self.style.SUCCESS(f'connection setup costs {overhead:.3f} ms per request'))
+
+    def measure(self, conn, max_age, requests):
+        conn.close()
+        conn.settings_dict['CONN_MAX_AGE'] = max_age
+        connects = []
+
+        def created(sender, connection, **kwargs):
+            if connection.alias == conn.alias:
+                connects.append(1)
+
+        connection_created.connect(created)
+        timings = []
+        try:
+            for _ in range(requests):
+                started = time.perf_counter()
+                # the same signals the handler sends: they close or keep the connection
+                request_started.send(sender=self.__class__)
+                with conn.cursor() as cursor:
+                    cursor.execute('SELECT 1')
+                    cursor.fetchone()
+                request_finished.send(sender=self.__class__)
+                timings.append((time.perf_counter() - started) * 1000)
+        finally:
+            connection_created.disconnect(created)
+        return len(connects), timings
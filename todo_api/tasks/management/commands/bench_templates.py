@@ -0,0 +1,74 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from django.template.backends.django import DjangoTemplates
+from django.test import RequestFactory, override_settings
+from django.utils import translation
+
+
+User = get_user_model()
+
+UNCACHED_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+CACHED_LOADERS = [('django.template.loaders.cached.Loader', UNCACHED_LOADERS)]
+
+NO_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                            'LOCATION': 'bench-templates'}}
+
+
+class Command(BaseCommand):
+    help = ('Measure per-request render time of a template before (uncached loaders, no fragment '
+            'cache) and after (cached loader, fragment cache).')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--template', default='base.html')
+        parser.add_argument('--iterations', type=int, default=1000)
+        parser.add_argument('--language', default=settings.LANGUAGE_CODE)
+
+    def handle(self, *args, **options):
+        self.request_factory = RequestFactory()
+        rows = [
+            ('before', UNCACHED_LOADERS, NO_CACHE),
+            ('after', CACHED_LOADERS, LOCMEM_CACHE),
+        ]
+        with translation.override(options['language']):
+            results = [(name, self.measure(loaders, caches, options)) for name, loaders, caches in rows]
+
+        self.stdout.write(f'{options["template"]}, {options["iterations"]} renders per profile')
+        self.stdout.write(f'{"profile":<8} {"mean ms":>9} {"p50 ms":>9} {"p95 ms":>9}')
+        for name, timings in results:
+            self.stdout.write('{:<8} {:>9.3f} {:>9.3f} {:>9.3f}'.format(
+                name, statistics.mean(timings), percentile(timings, 50), percentile(timings, 95)))
+        speedup = statistics.mean(results[0][1]) / statistics.mean(results[1][1])
+        self.stdout.write(self.style.SUCCESS(f'after is {speedup:.1f}x faster per request'))
+
+    def measure(self, loaders, caches, options):
+        template_settings = dict(settings.TEMPLATES[0])
+        del template_settings['BACKEND']
+        template_settings.update({'NAME': 'bench', 'APP_DIRS': False})
+        template_settings['OPTIONS'] = dict(template_settings['OPTIONS'], loaders=loaders)
+        engine = DjangoTemplates(template_settings)
+
+        users = [AnonymousUser(), User(pk=1, username='bench', email='bench@example.com')]
+        timings = []
+        with override_settings(CACHES=caches):
+            for i in range(options['iterations']):
+                request = self.request_factory.get('/')
+                request.user = users[i % 2]
+                started = time.perf_counter()
+                engine.get_template(options['template']).render({}, request)
+                timings.append((time.perf_counter() - started) * 1000)
+        return timings
+
+
+def percentile(values, percent):
+    values = sorted(values)
+    index = min(len(values) - 1, round(percent / 100 * (len(values) - 1)))
+    return values[index]
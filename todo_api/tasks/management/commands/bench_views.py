@@ -0,0 +1,144 @@
+import json
+import statistics
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from tasks import urls as tasks_urls
+from tasks.models import Project, Task
+from users import urls as users_urls
+
+from .bench_templates import percentile
+
+
+# views that end the session are re-logged in (untimed) after every request
+LOGS_OUT = {'users:logout'}
+
+
+class Command(BaseCommand):
+    help = ('Seed users x projects x tasks with the test factories, time every GET view of the tasks '
+            'and users apps with the test client and compare p50/p95 and query counts to a baseline.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=3)
+        parser.add_argument('--projects', type=int, default=5, help='Projects per user.')
+        parser.add_argument('--tasks', type=int, default=20, help='Tasks per project.')
+        parser.add_argument('--requests', type=int, default=20, help='Timed requests per view.')
+        parser.add_argument('--baseline', help='Baseline JSON to compare against.')
+        parser.add_argument('--save-baseline', help='Write the results as the new baseline JSON.')
+        parser.add_argument('--tolerance', type=float, default=0.25,
+                            help='Allowed p95 slowdown over the baseline (0.25 = 25%%).')
+        parser.add_argument('--in-place', action='store_true',
+                            help='Seed the configured database instead of a throwaway test database.')
+
+    def handle(self, *args, **options):
+        old_name = None
+        if not options['in_place']:
+            old_name = connection.settings_dict['NAME']
+            connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            with override_settings(ALLOWED_HOSTS=settings.ALLOWED_HOSTS + ['testserver']):
+                user = self.seed(options)
+                results = self.measure(user, options['requests'])
+        finally:
+            if old_name is not None:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        self.report(results)
+        if options['save_baseline']:
+            with open(options['save_baseline'], 'w') as baseline:
+                json.dump(results, baseline, indent=2, sort_keys=True)
+        if options['baseline']:
+            self.compare(results, options['baseline'], options['tolerance'])
+
+    def seed(self, options):
+        # the factories live with the tests and are only needed here
+        from tests.factories_projects import ProjectFactory
+        from tests.factories_tasks import TaskFactory
+        from tests.factories_users import UserFactory
+
+        started = time.perf_counter()
+        users = UserFactory.create_batch(options['users'])
+        for user in users:
+            for project in ProjectFactory.create_batch(options['projects'], user=user):
+                TaskFactory.create_batch(options['tasks'], project=project)
+        user = users[0]
+        user.is_staff = True
+        user.save()
+        self.stdout.write('seeded {} users, {} projects, {} tasks in {:.1f}s'.format(
+            len(users), Project.objects.count(), Task.objects.count(), time.perf_counter() - started))
+        return user
+
+    def get_urls(self, user):
+        project = Project.objects.filter(user=user).first()
+        task = Task.objects.filter(owner=user).first()
+        for module in (tasks_urls, users_urls):
+            for pattern in module.urlpatterns:
+                name = f'{module.app_name}:{pattern.name}'
+                kwargs = {}
+                if 'slug' in pattern.pattern.converters:
+                    kwargs['slug'] = task.slug if 'task' in pattern.name else project.slug
+                yield name, reverse(name, kwargs=kwargs)
+
+    def measure(self, user, requests):
+        client = Client()
+        client.force_login(user)
+        cache.clear()
+        results = {}
+        for name, url in self.get_urls(user):
+            self.request(client, url)  # warm up
+            if name in LOGS_OUT:
+                client.force_login(user)
+            timings, queries = [], []
+            for _ in range(requests):
+                with CaptureQueriesContext(connection) as context:
+                    started = time.perf_counter()
+                    status = self.request(client, url)
+                    timings.append((time.perf_counter() - started) * 1000)
+                queries.append(len(context))
+                if name in LOGS_OUT:
+                    client.force_login(user)
+            results[name] = {
+                'status': status,
+                'p50': round(percentile(timings, 50), 3),
+                'p95': round(percentile(timings, 95), 3),
+                'mean': round(statistics.mean(timings), 3),
+                'queries': max(queries),
+            }
+        return results
+
+    def request(self, client, url):
+        response = client.get(url)
+        if response.streaming:
+            b''.join(response.streaming_content)
+        return response.status_code
+
+    def report(self, results):
+        self.stdout.write(f'{"view":<28} {"status":>6} {"p50 ms":>9} {"p95 ms":>9} {"queries":>8}')
+        for name, result in results.items():
+            self.stdout.write('{:<28} {:>6} {:>9.3f} {:>9.3f} {:>8}'.format(
+                name, result['status'], result['p50'], result['p95'], result['queries']))
+
+    def compare(self, results, path, tolerance):
+        with open(path) as baseline:
+            baseline = json.load(baseline)
+        regressions = []
+        for name, result in results.items():
+            before = baseline.get(name)
+            if before is None:
+                continue
+            if result['queries'] > before['queries']:
+                regressions.append(f'{name}: {before["queries"]} -> {result["queries"]} queries')
+            if result['p95'] > before['p95'] * (1 + tolerance):
+                regressions.append(f'{name}: p95 {before["p95"]:.3f} -> {result["p95"]:.3f} ms')
+        if regressions:
+            for regression in regressions:
+                self.stderr.write(regression)
+            raise CommandError(f'{len(regressions)} regression(s) against {path}.')
+        self.stdout.write(self.style.SUCCESS(f'no regressions against {path}'))
@@ -0,0 +1,52 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from tasks.models import Project, Task
+from tasks.views import ProjectListView, TaskListView
+
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Print the query plans of the hot task/project queries to verify index use.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help='Email of the user to build the queries for (default: first user).')
+        parser.add_argument('--analyze', action='store_true',
+                            help='Execute the queries and show real timings (PostgreSQL only).')
+
+    def handle(self, *args, **options):
+        users = User.objects.order_by('id')
+        if options['user']:
+            users = users.filter(email=options['user'])
+        user = users.first()
+        if user is None:
+            raise CommandError('No user to build the queries for.')
+        project = Project.objects.filter(user=user).order_by('id').first()
+
+        explain_options = {}
+        if options['analyze']:
+            if connection.vendor != 'postgresql':
+                raise CommandError('--analyze is only supported on PostgreSQL.')
+            explain_options = {'analyze': True, 'buffers': True}
+
+        for title, queryset in self.get_queries(user, project):
+            self.stdout.write(self.style.MIGRATE_HEADING(title))
+            self.stdout.write(str(queryset.query))
+            self.stdout.write(queryset.explain(**explain_options))
+            self.stdout.write('')
+
+    def get_queries(self, user, project):
+        yield ('ProjectListView', Project.objects.for_list(user)
+               .order_by(*ProjectListView.keyset_ordering)[:ProjectListView.paginate_by])
+        yield ('TaskListView', Task.objects.for_list(user)
+               .order_by(*TaskListView.keyset_ordering)[:TaskListView.paginate_by])
+        if project is None:
+            return
+        yield ('Tasks of a project by status and priority',
+               Task.objects.filter(project=project, status=Task.COMPLETED, priority=Task.HIGN))
+        yield ('Newest tasks of a project', Task.objects.filter(project=project).order_by('-created'))
+        yield ('Uncompleted tasks of a project',
+               Task.objects.filter(project=project, status=Task.UNCOMPLETED).order_by('priority'))
@@ -0,0 +1,39 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.importers import DEFAULT_BATCH_SIZE, FORMATS, TaskImportError, guess_format, import_tasks, read_rows
+from tasks.models import Project
+
+
+class Command(BaseCommand):
+    help = 'Import tasks into a project from a CSV or JSON lines file, in batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='File to import, "-" reads standard input.')
+        parser.add_argument('--project', required=True, help='Slug of the target project.')
+        parser.add_argument('--format', choices=[fmt for fmt, _ in FORMATS],
+                            help='Input format (default: guessed from the file name, CSV for stdin).')
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                            help='Rows per INSERT and per transaction.')
+
+    def handle(self, *args, **options):
+        try:
+            project = Project.objects.select_related('user').get(slug=options['project'])
+        except Project.DoesNotExist:
+            raise CommandError(f'Project "{options["project"]}" does not exist.')
+
+        path = options['path']
+        fmt = options['format'] or guess_format(path)
+        stream = sys.stdin if path == '-' else open(path, encoding='utf-8-sig', newline='')
+        try:
+            result = import_tasks(read_rows(stream, fmt), project, batch_size=options['batch_size'])
+        except TaskImportError as exc:
+            raise CommandError(str(exc))
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {result.rows} tasks in {result.seconds:.2f}s ({result.rows_per_second:.0f} rows/sec).'
+        ))
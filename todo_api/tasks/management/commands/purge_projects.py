@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from tasks.deletion import purge_project
+from tasks.models import Project
+
+
+class Command(BaseCommand):
+    help = 'Delete the projects scheduled for deletion, their tasks in batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None,
+                            help='Tasks deleted per transaction (default PROJECT_DELETE_BATCH_SIZE).')
+        parser.add_argument('--pause', type=float, default=0,
+                            help='Seconds to sleep between batches.')
+        parser.add_argument('--forever', action='store_true',
+                            help='Keep polling for scheduled projects instead of exiting.')
+        parser.add_argument('--interval', type=float, default=5,
+                            help='Seconds between polls with --forever.')
+
+    def handle(self, *args, **options):
+        while True:
+            for project in Project.objects.filter(deleting=True).order_by('pk'):
+                pk = project.pk
+                deleted = purge_project(project, options['batch_size'], options['pause'])
+                self.stdout.write(f'Deleted project {pk} and {deleted} tasks.')
+            if not options['forever']:
+                break
+            time.sleep(options['interval'])
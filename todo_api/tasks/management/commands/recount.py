@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from tasks.models import Project
+
+
+class Command(BaseCommand):
+    help = 'Recompute the denormalized task counters of projects.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--project', action='append', dest='projects', metavar='SLUG',
+                            help='Only recount this project (repeatable).')
+
+    def handle(self, *args, **options):
+        projects = Project.objects.all()
+        if options['projects']:
+            projects = projects.filter(slug__in=options['projects'])
+        count = projects.recount()
+        projects.bump_list_versions()
+        self.stdout.write(self.style.SUCCESS(f'Recounted {count} projects.'))
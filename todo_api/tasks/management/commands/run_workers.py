@@ -0,0 +1,50 @@
+import os
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connection, connections
+
+from tasks.jobs import work
+
+
+class Command(BaseCommand):
+    help = 'Run queued background jobs (tasks.jobs) in a pool of worker threads.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=4, help='Worker threads (always 1 on SQLite).')
+        parser.add_argument('--poll-interval', type=float, default=1,
+                            help='Seconds an idle worker waits before looking for jobs again.')
+        parser.add_argument('--once', action='store_true',
+                            help='Exit once no job is left to claim instead of polling.')
+
+    def handle(self, *args, **options):
+        if connection.vendor == 'sqlite' and options['threads'] > 1:
+            # SQLite takes one writer at a time and fails a write that has to
+            # wait on another connection's, so more threads only add retries
+            self.stderr.write('SQLite allows a single writer, running one worker thread.')
+            options['threads'] = 1
+        prefix = f'{socket.gethostname()}:{os.getpid()}'
+        stop = threading.Event()
+        kwargs = {'stop': stop, 'once': options['once'], 'poll_interval': options['poll_interval']}
+        if options['threads'] <= 1:
+            count = work(f'{prefix}:0', **kwargs)
+        else:
+            with ThreadPoolExecutor(options['threads']) as pool:
+                futures = [pool.submit(self.work_in_thread, f'{prefix}:{i}', kwargs)
+                           for i in range(options['threads'])]
+                try:
+                    count = sum(future.result() for future in futures)
+                except KeyboardInterrupt:
+                    # running jobs are finished, nothing new is claimed
+                    stop.set()
+                    count = sum(future.result() for future in futures)
+        self.stdout.write(self.style.SUCCESS(f'Ran {count} jobs.'))
+
+    def work_in_thread(self, worker, kwargs):
+        try:
+            return work(worker, **kwargs)
+        finally:
+            # every thread has its own connections
+            connections.close_all()
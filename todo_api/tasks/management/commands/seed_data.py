@@ -0,0 +1,79 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils.crypto import get_random_string
+from django.utils.text import slugify
+
+from tasks.importers import assign_slugs
+from tasks.models import Project, Task
+
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = ('Insert generated users x projects x tasks with bulk_create for performance testing. '
+            'Every user gets the same password, hashed once.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10)
+        parser.add_argument('--projects', type=int, default=10, help='Projects per user.')
+        parser.add_argument('--tasks', type=int, default=100, help='Tasks per project.')
+        parser.add_argument('--password', default='seed-password')
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        # keeps usernames, emails and slugs of separate runs apart
+        prefix = 'seed-' + get_random_string(6, 'abcdefghijklmnopqrstuvwxyz0123456789')
+        started = time.perf_counter()
+
+        with transaction.atomic():
+            password = make_password(options['password'])
+            User.objects.bulk_create([
+                User(username=f'{prefix}-{i}', email=f'{prefix}-{i}@example.com', password=password)
+                for i in range(options['users'])
+            ], batch_size=batch_size)
+            # bulk_create only sets primary keys on PostgreSQL
+            users = list(User.objects.filter(username__startswith=f'{prefix}-').values_list('id', 'username'))
+
+            Project.objects.bulk_create([
+                Project(title=f'Project {j}', slug=f'project-{j}-{slugify(username)}', color=f'color-{j}',
+                        user_id=user_id)
+                for user_id, username in users for j in range(options['projects'])
+            ], batch_size=batch_size)
+            projects = {}
+            for project_id, user_id in (Project.objects.filter(user__username__startswith=f'{prefix}-')
+                                        .values_list('id', 'user_id')):
+                projects.setdefault(user_id, []).append(project_id)
+
+            tasks = 0
+            for user_id, username in users:
+                batch = []
+                for j, project_id in enumerate(projects.get(user_id, [])):
+                    for k in range(options['tasks']):
+                        # titles unique per user, so no slug needs a -<n> suffix
+                        batch.append(Task(
+                            project_id=project_id, owner_id=user_id,
+                            title=f'Project {j} task {k}', description='',
+                            priority=k % 3 - 1, status=k % 2,
+                        ))
+                        if len(batch) == batch_size:
+                            tasks += self.insert_tasks(batch, username)
+                            batch = []
+                if batch:
+                    tasks += self.insert_tasks(batch, username)
+
+        seconds = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(users)} users, {sum(map(len, projects.values()))} projects, {tasks} tasks in {seconds:.1f}s '
+            f'({tasks / seconds if seconds else tasks:.0f} tasks/s), prefix {prefix}, '
+            f'password {options["password"]!r}'))
+
+    def insert_tasks(self, batch, username):
+        # the slugs Task.save would give, so a later save doesn't rename them
+        assign_slugs(batch, username)
+        return len(Task.objects.bulk_create(batch))
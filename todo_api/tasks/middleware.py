@@ -0,0 +1,83 @@
+import json
+import logging
+import random
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+
+logger = logging.getLogger('tasks.query_timing')
+
+
+class QueryTimer:
+    """``execute_wrapper`` collecting count, total time and slowest statement."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.slowest_duration = 0.0
+        self.slowest_sql = None
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.count += 1
+            self.duration += elapsed
+            if self.slowest_sql is None or elapsed > self.slowest_duration:
+                self.slowest_duration, self.slowest_sql = elapsed, sql
+
+
+class QueryTimingMiddleware:
+    """
+    Time the SQL of a sample of requests and report it as ``Server-Timing``
+    headers and one JSON log line on the ``tasks.query_timing`` logger.
+    Disabled (and removed from the chain) while ``QUERY_TIMING_SAMPLE_RATE``
+    is 0. Streaming responses are measured up to the first byte only.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, 'QUERY_TIMING_SAMPLE_RATE', 0)
+        if not self.sample_rate:
+            raise MiddlewareNotUsed
+
+    def __call__(self, request):
+        if random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        timer = QueryTimer()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timer))
+            response = self.get_response(request)
+        total = time.perf_counter() - started
+
+        metrics = [
+            f'db;dur={timer.duration * 1000:.2f};desc="{timer.count} queries"',
+            f'db-slowest;dur={timer.slowest_duration * 1000:.2f}',
+            f'total;dur={total * 1000:.2f}',
+        ]
+        if response.has_header('Server-Timing'):
+            metrics.insert(0, response['Server-Timing'])
+        response['Server-Timing'] = ', '.join(metrics)
+
+        match = request.resolver_match
+        logger.info(json.dumps({
+            'method': request.method,
+            'path': request.path,
+            'view': match.view_name if match else None,
+            'status': response.status_code,
+            'queries': timer.count,
+            'db_ms': round(timer.duration * 1000, 2),
+            'total_ms': round(total * 1000, 2),
+            'slowest_ms': round(timer.slowest_duration * 1000, 2),
+            'slowest_sql': timer.slowest_sql,
+        }))
+        return response
@@ -0,0 +1,35 @@
+# Generated by Django 2.2.5 on 2026-10-18 15:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0004_auto_20190919_2209'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='task',
+            name='description',
+            field=models.TextField(blank=True, default='', null=True),
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='slug',
+            field=models.SlugField(max_length=255, null=True, unique=True),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['project', 'status', 'priority'], name='task_project_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['project', 'created'], name='task_project_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(status=0), fields=['project', 'priority'], name='task_uncompleted_idx'),
+        ),
+    ]
@@ -0,0 +1,47 @@
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+import django.db.models.deletion
+
+
+def backfill_owner(apps, schema_editor):
+    Project = apps.get_model('tasks', 'Project')
+    Task = apps.get_model('tasks', 'Task')
+    owner = Project.objects.filter(pk=OuterRef('project')).values('user')[:1]
+    Task.objects.update(owner=Subquery(owner))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('tasks', '0005_task_indexes'),
+    ]
+
+    operations = [
+        # Django 2.2 can't rebuild a SQLite table that has a partial index, so it
+        # is dropped while the table is altered and created again at the end.
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_uncompleted_idx',
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='owner',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='tasks', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.RunPython(backfill_owner, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='task',
+            name='owner',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='tasks', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['owner', 'created', 'id'], name='task_owner_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(status=0), fields=['project', 'priority'], name='task_uncompleted_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def recount(apps, schema_editor):
+    Project = apps.get_model('tasks', 'Project')
+    Task = apps.get_model('tasks', 'Task')
+    tasks = Task.objects.filter(project=OuterRef('pk')).order_by().values('project')
+    total = tasks.annotate(count=Count('pk')).values('count')
+    completed = tasks.filter(status=1).annotate(count=Count('pk')).values('count')
+    Project.objects.update(task_count=Coalesce(Subquery(total), 0),
+                           completed_count=Coalesce(Subquery(completed), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0006_task_owner'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='completed_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='task_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(recount, migrations.RunPython.noop),
+    ]
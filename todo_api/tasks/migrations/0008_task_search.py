@@ -0,0 +1,88 @@
+from django.db import migrations
+
+
+# The SQL is copied here rather than imported from tasks.search, so later
+# changes to that module can't rewrite what this migration did.
+
+POSTGRESQL_INSTALL = [
+    'ALTER TABLE tasks_task ADD COLUMN search_vector tsvector',
+    """
+    CREATE FUNCTION tasks_task_search_vector() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('simple', coalesce(NEW.title, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(NEW.description, '')), 'B');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER tasks_task_search_vector BEFORE INSERT OR UPDATE OF title, description
+    ON tasks_task FOR EACH ROW EXECUTE PROCEDURE tasks_task_search_vector()
+    """,
+    # fires the trigger for the existing rows
+    'UPDATE tasks_task SET title = title',
+    'CREATE INDEX task_search_vector_idx ON tasks_task USING GIN (search_vector)',
+]
+POSTGRESQL_UNINSTALL = [
+    'DROP TRIGGER IF EXISTS tasks_task_search_vector ON tasks_task',
+    'DROP FUNCTION IF EXISTS tasks_task_search_vector()',
+    'ALTER TABLE tasks_task DROP COLUMN IF EXISTS search_vector',
+]
+
+SQLITE_INSTALL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS tasks_task_fts
+    USING fts5(title, description, content='tasks_task', content_rowid='id')
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_task_fts_insert AFTER INSERT ON tasks_task BEGIN
+        INSERT INTO tasks_task_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_task_fts_delete AFTER DELETE ON tasks_task BEGIN
+        INSERT INTO tasks_task_fts(tasks_task_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_task_fts_update AFTER UPDATE OF title, description ON tasks_task BEGIN
+        INSERT INTO tasks_task_fts(tasks_task_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO tasks_task_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END
+    """,
+    "INSERT INTO tasks_task_fts(tasks_task_fts) VALUES ('rebuild')",
+]
+SQLITE_UNINSTALL = [
+    'DROP TRIGGER IF EXISTS tasks_task_fts_insert',
+    'DROP TRIGGER IF EXISTS tasks_task_fts_delete',
+    'DROP TRIGGER IF EXISTS tasks_task_fts_update',
+    'DROP TABLE IF EXISTS tasks_task_fts',
+]
+
+
+def install(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    statements = {'postgresql': POSTGRESQL_INSTALL, 'sqlite': SQLITE_INSTALL}.get(vendor, [])
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def uninstall(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    statements = {'postgresql': POSTGRESQL_UNINSTALL, 'sqlite': SQLITE_UNINSTALL}.get(vendor, [])
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0007_project_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(install, uninstall),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 2.2.5 on 2026-10-18 15:25
+
+from django.db import migrations, models
+
+
+def rename_duplicates(apps, schema_editor):
+    # the update form never checked colors, so existing rows may clash;
+    # every project after the first of a (user, value) pair gets its id appended
+    Project = apps.get_model('tasks', 'Project')
+    for field in ('title', 'color'):
+        max_length = Project._meta.get_field(field).max_length
+        seen = set()
+        for pk, user_id, value in Project.objects.order_by('pk').values_list('pk', 'user_id', field):
+            if (user_id, value) in seen:
+                suffix = f' ({pk})'
+                Project.objects.filter(pk=pk).update(**{field: value[:max_length - len(suffix)] + suffix})
+            else:
+                seen.add((user_id, value))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0008_task_search'),
+    ]
+
+    operations = [
+        migrations.RunPython(rename_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='project',
+            constraint=models.UniqueConstraint(fields=('user', 'title'), name='project_user_title_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='project',
+            constraint=models.UniqueConstraint(fields=('user', 'color'), name='project_user_color_uniq'),
+        ),
+    ]
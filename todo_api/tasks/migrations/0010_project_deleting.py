@@ -0,0 +1,34 @@
+# Generated by Django 2.2.5 on 2026-10-18 15:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0009_project_unique_title_color'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='project',
+            name='project_user_title_uniq',
+        ),
+        migrations.RemoveConstraint(
+            model_name='project',
+            name='project_user_color_uniq',
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='deleting',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddConstraint(
+            model_name='project',
+            constraint=models.UniqueConstraint(condition=models.Q(deleting=False), fields=('user', 'title'), name='project_user_title_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='project',
+            constraint=models.UniqueConstraint(condition=models.Q(deleting=False), fields=('user', 'color'), name='project_user_color_uniq'),
+        ),
+    ]
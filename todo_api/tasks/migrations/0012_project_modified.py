@@ -0,0 +1,20 @@
+# Generated by Django 2.2.5 on 2026-10-18 15:57
+
+from django.db import migrations
+import django.utils.timezone
+import model_utils.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0011_job'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='modified',
+            field=model_utils.fields.AutoLastModifiedField(default=django.utils.timezone.now, editable=False),
+        ),
+    ]
@@ -1,23 +1,155 @@
-from django.db import models
+import re
+from collections import Counter
+
+from django.db import models, transaction
+from django.db.models import Count, F, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.conf import settings
+from django.utils import timezone
 from django.utils.text import slugify
+from model_utils import FieldTracker
+from model_utils.fields import AutoLastModifiedField
 from model_utils.models import TimeStampedModel
 
+from .cache import bump_project_list_version
+
+
+class ProjectQuerySet(models.QuerySet):
+
+    def visible(self):
+        return self.filter(deleting=False)
+
+    def for_list(self, user):
+        # projects being deleted stay listed, with their progress and no links
+        return (self.filter(user=user)
+                .select_related('user')
+                .only('title', 'slug', 'color', 'task_count', 'completed_count', 'deleting', 'user__username'))
+
+    def list_stamp(self, user):
+        # every change to a project row moves ``modified``, the count catches
+        # deleted rows; read from the database, so changes made by other
+        # processes (workers, manage.py commands) count as well
+        stamp = self.filter(user=user).aggregate(count=Count('pk'), modified=Max('modified'))
+        return stamp['count'], stamp['modified']
+
+    def adjust_counts(self, tasks=0, completed=0):
+        return self.update(task_count=F('task_count') + tasks, completed_count=F('completed_count') + completed,
+                           modified=timezone.now())
+
+    def recount(self):
+        tasks = Task.objects.filter(project=OuterRef('pk')).order_by().values('project')
+        total = tasks.annotate(count=Count('pk')).values('count')
+        completed = tasks.filter(status=Task.COMPLETED).annotate(count=Count('pk')).values('count')
+        return self.update(task_count=Coalesce(Subquery(total), 0),
+                           completed_count=Coalesce(Subquery(completed), 0), modified=timezone.now())
+
+    def bump_list_versions(self):
+        for user_id in set(self.values_list('user_id', flat=True)):
+            bump_project_list_version(user_id)
+
 
 class Project(models.Model):
     title = models.CharField(max_length=120)
     slug = models.SlugField(max_length=120, unique=True, null=True)
     color = models.CharField(max_length=20)
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete = models.CASCADE)
+    # maintained by the Task signals and TaskQuerySet, `manage.py recount` repairs them
+    task_count = models.IntegerField(default=0, editable=False)
+    completed_count = models.IntegerField(default=0, editable=False)
+    # set by tasks.deletion.schedule_deletion, the row goes once its tasks are gone
+    deleting = models.BooleanField(default=False, editable=False)
+    # set by save and by the queryset updates above, see list_stamp
+    modified = AutoLastModifiedField()
+
+    objects = ProjectQuerySet.as_manager()
+    tracker = FieldTracker(fields=['user'])
+
+    class Meta:
+        constraints = [
+            # a project being deleted doesn't hold on to its title and color
+            models.UniqueConstraint(fields=['user', 'title'], name='project_user_title_uniq',
+                                    condition=models.Q(deleting=False)),
+            models.UniqueConstraint(fields=['user', 'color'], name='project_user_color_uniq',
+                                    condition=models.Q(deleting=False)),
+        ]
 
     def __str__(self):
         return f'{self.title} - {self.user.username}'
 
+    # only ever changed by queryset updates (adjust_counts, recount,
+    # tasks.deletion), which a save of a stale instance would undo
+    update_managed_fields = ('task_count', 'completed_count', 'deleting')
+
     def save(self, *args, **kwargs):
-        self.slug = '-'.join((slugify(self.title), slugify(self.user.username)))
+        if not self.deleting:
+            self.slug = '-'.join((slugify(self.title), slugify(self.user.username)))
+        if not self._state.adding and not kwargs.get('force_insert') and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [field.name for field in self._meta.concrete_fields
+                                       if not field.primary_key and field.name not in self.update_managed_fields]
+        reassigned = not self._state.adding and self.tracker.has_changed('user')
         super(Project, self).save(*args, **kwargs)
+        if reassigned:
+            Task.objects.filter(project=self).update(owner=self.user)
+
+
+
+class TaskQuerySet(models.QuerySet):
+
+    def for_user(self, user):
+        # tasks of a project being deleted are hidden until the worker gets to them
+        return self.filter(owner=user, project__deleting=False)
 
+    def for_list(self, user):
+        # fields watched by Task.tracker must not be deferred
+        return (self.for_user(user)
+                .select_related('project__user')
+                .only('title', 'slug', 'priority', 'status', 'created', 'owner',
+                      'project__title', 'project__slug', 'project__color', 'project__user',
+                      'project__user__username'))
 
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = super(TaskQuerySet, self).bulk_create(objs, *args, **kwargs)
+        tasks = Counter(task.project_id for task in objs)
+        completed = Counter(task.project_id for task in objs if task.status == Task.COMPLETED)
+        for project_id, count in tasks.items():
+            Project.objects.filter(pk=project_id).adjust_counts(count, completed[project_id])
+        Project.objects.filter(pk__in=tasks).bump_list_versions()
+        return objs
+
+    def update(self, **kwargs):
+        if not {'status', 'project', 'project_id'} & set(kwargs):
+            return super(TaskQuerySet, self).update(**kwargs)
+
+        target = kwargs['project'] if 'project' in kwargs else kwargs.get('project_id')
+        # update() takes an instance or a primary key alike
+        target = getattr(target, 'pk', target)
+        if target is not None and not {'owner', 'owner_id'} & set(kwargs):
+            kwargs['owner_id'] = Project.objects.values_list('user_id', flat=True).get(pk=target)
+
+        # queryset updates don't send signals, so the counters of every
+        # touched project are recomputed instead
+        with transaction.atomic(using=self.db):
+            project_ids = set(self.order_by().values_list('project_id', flat=True).distinct())
+            if target is not None:
+                project_ids.add(target)
+            rows = super(TaskQuerySet, self).update(**kwargs)
+            projects = Project.objects.filter(pk__in=project_ids)
+            projects.recount()
+        projects.bump_list_versions()
+        return rows
+
+    def bulk_delete(self):
+        """
+        One ``DELETE`` for the matching tasks, without loading them or sending
+        per-row signals (the ``Collector`` does both); counters are recounted.
+        """
+        with transaction.atomic(using=self.db):
+            projects = Project.objects.filter(
+                pk__in=set(self.order_by().values_list('project_id', flat=True).distinct()))
+            rows = self.order_by()._raw_delete(self.db)
+            projects.recount()
+        projects.bump_list_versions()
+        return rows
 
 
 class Task(TimeStampedModel):
@@ -31,16 +163,109 @@ class Task(TimeStampedModel):
     UNCOMPLETED = 0
     STATUS = ((COMPLETED, 'Completed'),(UNCOMPLETED, 'Uncompleted'))
 
+    # ``-<n>`` suffixes up to ten digits
+    SLUG_SUFFIX_ROOM = 11
+
     project = models.ForeignKey('Project', on_delete = models.CASCADE, related_name = 'project')
+    # always project.user, kept here so per-user task queries don't join tasks_project
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete = models.CASCADE, related_name = 'tasks',
+                              editable = False)
     title = models.CharField(max_length = 255)
     slug = models.SlugField(max_length=255, unique=True, null=True)
     description = models.TextField(blank=True, null=True, default='')
     priority = models.IntegerField(choices=PRIORITY, default = HIGN)
     status = models.IntegerField(choices = STATUS, default = UNCOMPLETED)
 
+    objects = TaskQuerySet.as_manager()
+    tracker = FieldTracker(fields=['project', 'owner', 'status', 'title'])
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['project', 'status', 'priority'], name='task_project_status_idx'),
+            models.Index(fields=['project', 'created'], name='task_project_created_idx'),
+            models.Index(fields=['owner', 'created', 'id'], name='task_owner_created_idx'),
+            models.Index(fields=['project', 'priority'], name='task_uncompleted_idx',
+                         condition=models.Q(status=0)),  # Task.UNCOMPLETED
+        ]
+
     def __str__(self):
         return self.title
 
     def save(self, *args, **kwargs):
-        self.slug = '-'.join((slugify(self.title), slugify(self.project.user.username)))
-        super(Task, self).save(*args, **kwargs)
\ No newline at end of file
+        adding = self._state.adding
+        if adding or self.tracker.has_changed('project'):
+            # a reassigned project moves its tasks itself, see Project.save
+            self.set_owner(self.project)
+        # the username is only read when the slug may be stale
+        if not self.slug or adding or self.tracker.has_changed('owner') or self.tracker.has_changed('title'):
+            base = self.slug_base(self.title, self.owner.username)
+            if not self.slug or not re.fullmatch(rf'{re.escape(base)}(-\d+)?', self.slug):
+                self.slug = self.free_slug(base)
+        super(Task, self).save(*args, **kwargs)
+
+    def set_owner(self, project):
+        if self.owner_id == project.user_id:
+            return
+        if project._meta.get_field('user').is_cached(project):
+            self.owner = project.user
+        else:
+            # Django 2.2 keeps a cached owner when only owner_id changes
+            self.owner_id = project.user_id
+            owner = self._meta.get_field('owner')
+            if owner.is_cached(self):
+                owner.delete_cached_value(self)
+
+    @classmethod
+    def slug_base(cls, title, username):
+        # the title is cut so the slug, with the username and the ``-<n>`` of
+        # a taken title, still fits the column
+        username = slugify(username)
+        room = cls._meta.get_field('slug').max_length - len(username) - len('-') - cls.SLUG_SUFFIX_ROOM
+        return f"{slugify(title)[:room].rstrip('-')}-{username}"
+
+    def free_slug(self, base):
+        # ``<base>-<n>`` for a taken title, like importers.assign_slugs
+        taken = set(Task.objects.filter(models.Q(slug=base) | models.Q(slug__startswith=f'{base}-'))
+                    .exclude(pk=self.pk).values_list('slug', flat=True))
+        slug, n = base, 1
+        while slug in taken:
+            n += 1
+            slug = f'{base}-{n}'
+        return slug
+
+
+class Job(TimeStampedModel):
+    """
+    A unit of background work run by ``manage.py run_workers``, see
+    ``tasks.jobs``. ``name`` picks the registered handler, ``payload`` is
+    its JSON encoded keyword arguments.
+    """
+
+    QUEUED = 0
+    RUNNING = 1
+    DONE = 2
+    FAILED = 3
+    STATUS = ((QUEUED, 'Queued'), (RUNNING, 'Running'), (DONE, 'Done'), (FAILED, 'Failed'))
+
+    name = models.CharField(max_length=100)
+    payload = models.TextField(default='{}')
+    # jobs of one user are limited to JOB_USER_CONCURRENCY at a time
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='jobs',
+                             null=True, blank=True)
+    status = models.IntegerField(choices=STATUS, default=QUEUED)
+    attempts = models.IntegerField(default=0)
+    max_attempts = models.IntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now)
+    # a running job whose worker died is claimable again once this passes
+    locked_until = models.DateTimeField(null=True, blank=True)
+    locked_by = models.CharField(max_length=100, blank=True, default='')
+    error = models.TextField(blank=True, default='')
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'run_after'], name='job_status_run_after_idx'),
+            models.Index(fields=['user', 'status'], name='job_user_status_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.name} #{self.pk}'
@@ -0,0 +1,166 @@
+import base64
+import binascii
+import json
+from functools import reduce
+from operator import or_
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.http import Http404
+from django.utils.functional import cached_property
+
+
+NEXT = 'n'
+PREVIOUS = 'p'
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+def encode_cursor(direction, values):
+    payload = json.dumps([direction, values], default=lambda value: value.isoformat())
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        payload = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        direction, values = json.loads(payload.decode())
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+        raise InvalidCursor(cursor)
+    if direction not in (NEXT, PREVIOUS) or not isinstance(values, list):
+        raise InvalidCursor(cursor)
+    return direction, values
+
+
+class KeysetPage:
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """
+    Cursor pagination over a unique, ascending ``ordering`` (the last field
+    must be unique, e.g. ``id``). Every page is a ``WHERE ... LIMIT`` seek, so
+    the cost doesn't depend on how deep the user paged.
+    """
+
+    def __init__(self, queryset, ordering, per_page):
+        self.queryset = queryset
+        self.ordering = tuple(ordering)
+        self.per_page = per_page
+
+    def page(self, cursor=None):
+        if cursor:
+            direction, values = decode_cursor(cursor)
+            values = self._to_python(values)
+        else:
+            direction, values = NEXT, None
+
+        queryset = self.queryset
+        if direction == NEXT:
+            if values is not None:
+                queryset = queryset.filter(self._seek(values, 'gt'))
+            queryset = queryset.order_by(*self.ordering)
+        else:
+            queryset = queryset.filter(self._seek(values, 'lt'))
+            queryset = queryset.order_by(*('-' + field for field in self.ordering))
+
+        rows = list(queryset[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+
+        if direction == NEXT:
+            next_cursor = self._cursor(NEXT, rows[-1]) if has_more else None
+            previous_cursor = self._cursor(PREVIOUS, rows[0]) if values is not None and rows else None
+        else:
+            rows.reverse()
+            next_cursor = self._cursor(NEXT, rows[-1]) if rows else None
+            previous_cursor = self._cursor(PREVIOUS, rows[0]) if has_more else None
+        return KeysetPage(rows, next_cursor, previous_cursor)
+
+    def _to_python(self, values):
+        if len(values) != len(self.ordering):
+            raise InvalidCursor(values)
+        opts = self.queryset.model._meta
+        try:
+            return [opts.get_field(field).to_python(value) for field, value in zip(self.ordering, values)]
+        except ValidationError:
+            raise InvalidCursor(values)
+
+    def _seek(self, values, lookup):
+        # (a, b) > (x, y)  <=>  a > x OR (a = x AND b > y)
+        conditions = []
+        for i, field in enumerate(self.ordering):
+            equal = dict(zip(self.ordering[:i], values[:i]))
+            equal['{}__{}'.format(field, lookup)] = values[i]
+            conditions.append(Q(**equal))
+        return reduce(or_, conditions)
+
+    def _cursor(self, direction, obj):
+        if isinstance(obj, dict):  # .values() querysets
+            return encode_cursor(direction, [obj[field] for field in self.ordering])
+        return encode_cursor(direction, [getattr(obj, field) for field in self.ordering])
+
+
+class KeysetPaginationMixin:
+    """ListView mixin replacing page-number pagination with cursors."""
+    paginate_by = 50
+    keyset_ordering = ('id',)
+    cursor_kwarg = 'cursor'
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator = KeysetPaginator(queryset, self.keyset_ordering, page_size)
+        try:
+            page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        except InvalidCursor:
+            raise Http404('Invalid cursor.')
+        return (paginator, page, page.object_list, page.has_other_pages())
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Page-number paginator for the admin that takes the row count of an
+    unfiltered PostgreSQL table from the planner statistics (``reltuples``)
+    instead of a ``COUNT(*)`` over the whole table. Filtered querysets, small
+    tables and other databases get the exact count.
+    """
+    estimate_threshold = 10000
+
+    @cached_property
+    def count(self):
+        estimate = self.estimated_count()
+        if estimate is not None and estimate > self.estimate_threshold:
+            return estimate
+        return super(EstimatedCountPaginator, self).count
+
+    def estimated_count(self):
+        queryset = self.object_list
+        connection = connections[queryset.db]
+        if connection.vendor != 'postgresql' or queryset.query.where:
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT reltuples FROM pg_class WHERE relname = %s', [queryset.model._meta.db_table])
+            row = cursor.fetchone()
+        return int(row[0]) if row else None
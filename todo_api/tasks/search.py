@@ -0,0 +1,141 @@
+"""
+Full-text search over task titles and descriptions.
+
+The index lives outside the ORM and is maintained by the database itself:
+
+* PostgreSQL: a ``search_vector`` tsvector column on ``tasks_task``, filled by
+  a trigger and GIN indexed.
+* SQLite: an external-content FTS5 table ``tasks_task_fts`` kept in sync by
+  triggers.
+
+Both are installed by migration 0008, which keeps its own copy of the SQL.
+On SQLite a migration that rebuilds ``tasks_task`` drops the triggers with
+the old table and has to create them again; the ``tasks.E001`` check
+(``manage.py check --tag database``) reports them missing.
+"""
+import re
+
+from django.db import NotSupportedError, connection
+
+from .models import Task
+from .pagination import NEXT, PREVIOUS, InvalidCursor, KeysetPage, decode_cursor, encode_cursor
+
+
+# Lower score is a better match: FTS5's bm25() is already negative, ts_rank()
+# is negated. Title matches weigh more than description matches.
+POSTGRESQL_SEARCH = """
+    SELECT t.id, -ts_rank(t.search_vector, to_tsquery('simple', %s))::float8 AS score
+    FROM tasks_task t JOIN tasks_project p ON p.id = t.project_id
+    WHERE t.owner_id = %s AND t.search_vector @@ to_tsquery('simple', %s) AND NOT p.deleting
+"""
+SQLITE_SEARCH = """
+    SELECT t.id, bm25(tasks_task_fts, 10.0, 1.0) AS score
+    FROM tasks_task_fts JOIN tasks_task t ON t.id = tasks_task_fts.rowid JOIN tasks_project p ON p.id = t.project_id
+    WHERE tasks_task_fts MATCH %s AND t.owner_id = %s AND NOT p.deleting
+"""
+
+WORD_RE = re.compile(r'\w+')
+
+
+# what migration 0008 installs, see missing_objects
+POSTGRESQL_OBJECTS = {
+    'trigger': ['tasks_task_search_vector'],
+    'index': ['task_search_vector_idx'],
+}
+SQLITE_OBJECTS = {
+    'table': ['tasks_task_fts'],
+    'trigger': ['tasks_task_fts_insert', 'tasks_task_fts_delete', 'tasks_task_fts_update'],
+}
+
+
+def missing_objects(connection):
+    """Return the names of the index's tables, triggers and indexes not in the database."""
+    if connection.vendor == 'postgresql':
+        expected = POSTGRESQL_OBJECTS
+        sql = {
+            'trigger': "SELECT tgname FROM pg_trigger WHERE tgrelid = 'tasks_task'::regclass",
+            'index': "SELECT indexname FROM pg_indexes WHERE tablename = 'tasks_task'",
+        }
+    elif connection.vendor == 'sqlite':
+        expected = SQLITE_OBJECTS
+        sql = {kind: f"SELECT name FROM sqlite_master WHERE type = '{kind}'" for kind in expected}
+    else:
+        return []
+    missing = []
+    with connection.cursor() as cursor:
+        if Task._meta.db_table not in connection.introspection.table_names(cursor):
+            # not migrated yet
+            return []
+        for kind, names in expected.items():
+            cursor.execute(sql[kind])
+            present = {row[0] for row in cursor.fetchall()}
+            missing.extend(name for name in names if name not in present)
+    return missing
+
+
+def _search_sql(words):
+    """Return the ranked query and its parameters (without the user) for ``words``."""
+    # every word has to match, the last one as a prefix so results show up while typing
+    if connection.vendor == 'postgresql':
+        tsquery = ' & '.join(words[:-1] + [words[-1] + ':*'])
+        return POSTGRESQL_SEARCH, lambda user_id: [tsquery, user_id, tsquery]
+    if connection.vendor == 'sqlite':
+        match = ' '.join(['"{}"'.format(word) for word in words[:-1]] + ['"{}"*'.format(words[-1])])
+        return SQLITE_SEARCH, lambda user_id: [match, user_id]
+    raise NotSupportedError(f'Task search is not available on {connection.vendor}.')
+
+
+def _cursor(direction, row):
+    task_id, score = row
+    return encode_cursor(direction, [score, task_id])
+
+
+def search_tasks(user, text, cursor=None, per_page=50):
+    """
+    Return a ``KeysetPage`` of ``user``'s tasks matching ``text``, best match
+    first. Pages are seeks on ``(score, id)``, like the list views.
+    """
+    words = WORD_RE.findall(text.lower())
+    if not words:
+        return KeysetPage([])
+    sql, params = _search_sql(words)
+    params = params(user.pk)
+
+    direction, values = NEXT, None
+    if cursor:
+        direction, values = decode_cursor(cursor)
+        try:
+            values = [float(values[0]), int(values[1])]
+        except (IndexError, TypeError, ValueError):
+            raise InvalidCursor(cursor)
+
+    operator, order = ('>', 'ASC') if direction == NEXT else ('<', 'DESC')
+    sql = f'SELECT id, score FROM ({sql}) matches'
+    if values is not None:
+        sql += f' WHERE score {operator} %s OR (score = %s AND id {operator} %s)'
+        params += [values[0], values[0], values[1]]
+    sql += f' ORDER BY score {order}, id {order} LIMIT %s'
+    params.append(per_page + 1)
+
+    with connection.cursor() as db:
+        db.execute(sql, params)
+        rows = db.fetchall()
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    if direction == PREVIOUS:
+        rows.reverse()
+
+    tasks = Task.objects.select_related('project').in_bulk([task_id for task_id, _ in rows])
+    object_list = []
+    for task_id, score in rows:
+        task = tasks[task_id]
+        task.score = score
+        object_list.append(task)
+
+    if direction == NEXT:
+        next_cursor = _cursor(NEXT, rows[-1]) if has_more else None
+        previous_cursor = _cursor(PREVIOUS, rows[0]) if values is not None and rows else None
+    else:
+        next_cursor = _cursor(NEXT, rows[-1]) if rows else None
+        previous_cursor = _cursor(PREVIOUS, rows[0]) if has_more else None
+    return KeysetPage(object_list, next_cursor, previous_cursor)
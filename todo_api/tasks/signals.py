@@ -0,0 +1,87 @@
+import time
+
+from django.conf import settings
+from django.core.signals import request_finished, request_started
+from django.db import connections
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .cache import bump_project_list_version
+from .models import Project, Task
+
+
+@receiver(post_save, sender=Project)
+def project_saved(sender, instance, **kwargs):
+    bump_project_list_version(instance.user_id)
+    previous_user = instance.tracker.previous('user')
+    if previous_user is not None and previous_user != instance.user_id:
+        bump_project_list_version(previous_user)
+
+
+@receiver(post_delete, sender=Project)
+def project_deleted(sender, instance, **kwargs):
+    bump_project_list_version(instance.user_id)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def user_saved(sender, instance, created, **kwargs):
+    # the list shows the owner's username
+    if not created:
+        bump_project_list_version(instance.pk)
+
+
+def _completed(status):
+    return int(status == Task.COMPLETED)
+
+
+@receiver(post_save, sender=Task)
+def task_saved(sender, instance, created, **kwargs):
+    completed = _completed(instance.status)
+    if created:
+        Project.objects.filter(pk=instance.project_id).adjust_counts(1, completed)
+        bump_project_list_version(instance.owner_id)
+        return
+
+    tracker = instance.tracker
+    was_completed = _completed(tracker.previous('status'))
+    if tracker.has_changed('project'):
+        Project.objects.filter(pk=tracker.previous('project')).adjust_counts(-1, -was_completed)
+        Project.objects.filter(pk=instance.project_id).adjust_counts(1, completed)
+    elif completed != was_completed:
+        Project.objects.filter(pk=instance.project_id).adjust_counts(0, completed - was_completed)
+    else:
+        return
+    bump_project_list_version(instance.owner_id)
+    if tracker.has_changed('owner'):
+        bump_project_list_version(tracker.previous('owner'))
+
+
+@receiver(post_delete, sender=Task)
+def task_deleted(sender, instance, **kwargs):
+    Project.objects.filter(pk=instance.project_id).adjust_counts(-1, -_completed(instance.status))
+    bump_project_list_version(instance.owner_id)
+
+
+@receiver(request_started)
+def check_connections(**kwargs):
+    # Django 2.2 has no CONN_HEALTH_CHECKS (added in 4.1), so honour the same
+    # key here: a persistent connection the server may have dropped while idle
+    # is closed before the request instead of failing its first query. Only
+    # connections idle for CONN_HEALTH_CHECK_IDLE seconds are pinged, a busy
+    # worker doesn't pay a round trip per request.
+    now = time.monotonic()
+    for conn in connections.all():
+        if not conn.settings_dict.get('CONN_HEALTH_CHECKS') or conn.connection is None:
+            continue
+        idle = conn.settings_dict.get('CONN_HEALTH_CHECK_IDLE', 30)
+        last_used = getattr(conn, 'health_check_last_used', None)
+        if (last_used is None or now - last_used > idle) and not conn.is_usable():
+            conn.close()
+
+
+@receiver(request_finished)
+def mark_connections_used(**kwargs):
+    now = time.monotonic()
+    for conn in connections.all():
+        if conn.connection is not None:
+            conn.health_check_last_used = now
@@ -1,8 +1,9 @@
 from django.urls import path
 
 from tasks import views
-from tasks.views import (ProjectListView, ProjectCreateView, ProjectUpdateView, ProjectDeleteView,
-                         TaskListView,)
+from tasks.api import ProjectApiListView, ProjectApiDetailView, TaskApiListView, TaskApiBulkView, TaskApiDetailView
+from tasks.views import (ProjectListView, ProjectCreateView, ProjectUpdateView, ProjectDeleteView, ProjectCacheStatsView,
+                         TaskListView, TaskSearchView, TaskImportView, TaskExportView,)
 
 
 app_name = 'tasks'
@@ -13,6 +14,16 @@ urlpatterns = [
     path('project-update/<str:slug>/', ProjectUpdateView.as_view(), name='project_update'),
     path('project-delete/<str:slug>', ProjectDeleteView.as_view(), name='project_delete'),
     path('project-list/', ProjectListView.as_view(), name='project_list'),
+    path('project-cache-stats/', ProjectCacheStatsView.as_view(), name='project_cache_stats'),
 
     path('task-list/', TaskListView.as_view(), name='task_list'),
+    path('task-search/', TaskSearchView.as_view(), name='task_search'),
+    path('task-import/', TaskImportView.as_view(), name='task_import'),
+    path('task-export/', TaskExportView.as_view(), name='task_export'),
+
+    path('api/projects/', ProjectApiListView.as_view(), name='api_project_list'),
+    path('api/projects/<str:slug>/', ProjectApiDetailView.as_view(), name='api_project_detail'),
+    path('api/tasks/', TaskApiListView.as_view(), name='api_task_list'),
+    path('api/tasks/bulk/', TaskApiBulkView.as_view(), name='api_task_bulk'),
+    path('api/tasks/<str:slug>/', TaskApiDetailView.as_view(), name='api_task_detail'),
 ]
\ No newline at end of file
@@ -1,12 +1,27 @@
+import io
+
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.contrib import messages
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Max
+from django.http import Http404, HttpResponseRedirect, JsonResponse, StreamingHttpResponse
 from django.shortcuts import render
 from django.urls import reverse
-from django.views.generic import ListView, CreateView, UpdateView, DeleteView
+from django.utils.functional import cached_property
+from django.utils.http import urlencode
+from django.views.generic import View, ListView, CreateView, UpdateView, DeleteView, FormView, TemplateView
 
 
 from .models import Project, Task
-from .forms import ProjectCreateForm, ProjectUpdateForm
+from .forms import ProjectCreateForm, ProjectUpdateForm, TaskImportForm
+from .cache import ConditionalGetMixin, cached_project_list, project_list_stats
+from .deletion import purge_project, schedule_deletion
+from .exporters import CONTENT_TYPES, export_tasks
+from .importers import TaskImportError, guess_format, import_tasks, read_rows
+from .jobs import enqueue
+from .pagination import InvalidCursor, KeysetPaginationMixin
+from .search import search_tasks
 
 
 def index(request):
@@ -14,10 +29,42 @@ def index(request):
     return render(request, 'base.html', context = {'test':'LALALLALALAA', 'user':user})
 
 
-class ProjectListView(ListView):
+class ProjectListView(LoginRequiredMixin, ConditionalGetMixin, KeysetPaginationMixin, ListView):
     model = Project
+    keyset_ordering = ('title', 'id')
+
+    @cached_property
+    def list_stamp(self):
+        return self.model.objects.list_stamp(self.request.user)
+
+    def get_change_stamp(self):
+        # the list shows the username as well; the project list version would
+        # do, but it lives in the cache, which other processes may not share
+        count, last_modified = self.list_stamp
+        return (count, last_modified, self.request.user.username), last_modified
+
     def get_queryset(self):
-        return self.model.objects.filter(user=self.request.user)
+        return self.model.objects.for_list(self.request.user)
+
+    def paginate_queryset(self, queryset, page_size):
+        cursor = self.request.GET.get(self.cursor_kwarg) or ''
+        paginate = super(ProjectListView, self).paginate_queryset
+        # only the page is cached: the paginator holds the unevaluated queryset;
+        # the stamp goes into the key as the version bumps of workers don't
+        # reach the cache of this process with LocMemCache
+        stamp, _ = self.get_change_stamp()
+        page = cached_project_list(self.request.user.pk, repr((page_size, cursor, stamp)),
+                                   lambda: paginate(queryset, page_size)[1])
+        return (None, page, page.object_list, page.has_other_pages())
+
+
+class ProjectCacheStatsView(LoginRequiredMixin, UserPassesTestMixin, View):
+
+    def get(self, request, *args, **kwargs):
+        return JsonResponse(project_list_stats())
+
+    def test_func(self):
+        return self.request.user.is_staff
 
 
 class ProjectCreateView(LoginRequiredMixin, CreateView):
@@ -31,7 +78,12 @@ class ProjectCreateView(LoginRequiredMixin, CreateView):
 
     def form_valid(self, form):
         form.instance.user = self.request.user
-        return super(ProjectCreateView, self).form_valid(form)
+        try:
+            return super(ProjectCreateView, self).form_valid(form)
+        except IntegrityError:
+            if not form.errors:
+                raise
+            return self.form_invalid(form)
 
     def get_success_url(self):
         messages.add_message(self.request, messages.INFO, 'Success: Project was created.')
@@ -40,15 +92,23 @@ class ProjectCreateView(LoginRequiredMixin, CreateView):
 
 class ProjectUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
     model = Project
+    queryset = Project.objects.visible()
     form_class = ProjectUpdateForm
     template_name = 'tasks/project_create.html'
 
     def get_form_kwargs(self, *args, **kwargs):
         kwargs = super(ProjectUpdateView, self).get_form_kwargs(*args, **kwargs)
         kwargs['user'] = self.request.user
-        kwargs['slug'] = self.kwargs['slug']
         return kwargs
 
+    def form_valid(self, form):
+        try:
+            return super(ProjectUpdateView, self).form_valid(form)
+        except IntegrityError:
+            if not form.errors:
+                raise
+            return self.form_invalid(form)
+
     def get_success_url(self):
         messages.add_message(self.request, messages.INFO, 'Success: Project was updated.')
         return reverse('tasks:project_list')
@@ -62,10 +122,24 @@ class ProjectUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
 
 class ProjectDeleteView(LoginRequiredMixin, UserPassesTestMixin,DeleteView):
     model = Project
+    queryset = Project.objects.visible()
     template_name = 'tasks/project_delete.html'
 
+    def delete(self, request, *args, **kwargs):
+        # a project with more tasks than one batch is only hidden here, its
+        # tasks are deleted in batches by a `delete_project` job
+        self.object = self.get_object()
+        if self.object.task_count <= settings.PROJECT_DELETE_BATCH_SIZE:
+            purge_project(self.object)
+            messages.add_message(request, messages.INFO, 'Success: Project was deleted.')
+        else:
+            with transaction.atomic():
+                schedule_deletion(self.object)
+                enqueue('delete_project', user=self.object.user, project_id=self.object.pk)
+            messages.add_message(request, messages.INFO, 'Success: Project is being deleted.')
+        return HttpResponseRedirect(self.get_success_url())
+
     def get_success_url(self):
-        messages.add_message(self.request, messages.INFO, 'Success: Project was deleted.')
         return reverse('tasks:project_list')
 
     def test_func(self):
@@ -80,7 +154,83 @@ class ProjectDeleteView(LoginRequiredMixin, UserPassesTestMixin,DeleteView):
 ######           TASKS
 ##############################################################################################################
 
-class TaskListView(LoginRequiredMixin, ListView):
+class TaskListView(LoginRequiredMixin, ConditionalGetMixin, KeysetPaginationMixin, ListView):
     model = Task
+    keyset_ordering = ('created', 'id')
+
+    def get_change_stamp(self):
+        # the count catches deletions, the projects' modified changes to the
+        # projects shown next to each task; base.html shows the username
+        user = self.request.user
+        stamp = self.model.objects.for_user(user).aggregate(
+            last_modified=Max('modified'), count=Count('pk'), project_modified=Max('project__modified'))
+        return ((stamp['last_modified'], stamp['count'], stamp['project_modified'], user.username),
+                stamp['last_modified'])
+
     def get_queryset(self):
-        return self.model.objects.filter(project__user=self.request.user)
\ No newline at end of file
+        return self.model.objects.for_list(self.request.user)
+
+
+class TaskSearchView(LoginRequiredMixin, TemplateView):
+    template_name = 'tasks/task_search.html'
+    paginate_by = 50
+
+    def get_context_data(self, **kwargs):
+        context = super(TaskSearchView, self).get_context_data(**kwargs)
+        query = self.request.GET.get('q', '').strip()
+        try:
+            page = search_tasks(self.request.user, query, self.request.GET.get('cursor'), self.paginate_by)
+        except InvalidCursor:
+            raise Http404('Invalid cursor.')
+        context.update({
+            'query': query,
+            'query_string': urlencode({'q': query}),
+            'object_list': page.object_list,
+            'page_obj': page,
+            'is_paginated': page.has_other_pages(),
+        })
+        return context
+
+
+class TaskImportView(LoginRequiredMixin, FormView):
+    template_name = 'tasks/task_import.html'
+    form_class = TaskImportForm
+
+    def get_form_kwargs(self, *args, **kwargs):
+        kwargs = super(TaskImportView, self).get_form_kwargs(*args, **kwargs)
+        kwargs['user'] = self.request.user
+        return kwargs
+
+    def form_valid(self, form):
+        upload = form.cleaned_data['file']
+        fmt = form.cleaned_data['format'] or guess_format(upload.name)
+        stream = io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='')
+        try:
+            result = import_tasks(read_rows(stream, fmt), form.cleaned_data['project'])
+        except (TaskImportError, UnicodeDecodeError) as exc:
+            form.add_error('file', str(exc))
+            return self.form_invalid(form)
+        messages.add_message(self.request, messages.INFO,
+                             f'Success: {result.rows} tasks were imported ({result.rows_per_second:.0f} rows/sec).')
+        return super(TaskImportView, self).form_valid(form)
+
+    def get_success_url(self):
+        return reverse('tasks:task_list')
+
+
+class TaskExportView(LoginRequiredMixin, View):
+
+    def get(self, request, *args, **kwargs):
+        fmt = request.GET.get('format', 'csv')
+        if fmt not in CONTENT_TYPES:
+            raise Http404('Unknown export format.')
+        compress = request.GET.get('gzip') == '1'
+
+        filename = f'tasks.{fmt}'
+        content_type = CONTENT_TYPES[fmt]
+        if compress:
+            filename += '.gz'
+            content_type = 'application/gzip'
+        response = StreamingHttpResponse(export_tasks(request.user, fmt, compress), content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
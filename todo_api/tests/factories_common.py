@@ -8,4 +8,15 @@ class BaseModelFactory(factory.django.DjangoModelFactory):
         try:
             return cls._meta.model.objects.latest('id').id + 1
         except cls._meta.model.DoesNotExist:
-            return 1
\ No newline at end of file
+            return 1
+
+    @classmethod
+    def create_bulk(cls, size, batch_size=1000, **kwargs):
+        """
+        ``create_batch`` built in memory and written with one ``bulk_create``:
+        no ``save()``, no signals except the manager's own bookkeeping. Related
+        objects must be passed in already saved, and the returned objects only
+        have primary keys on databases that return them (PostgreSQL).
+        """
+        objs = cls.build_batch(size, **kwargs)
+        return cls._meta.model._default_manager.bulk_create(objs, batch_size=batch_size)
@@ -9,6 +9,7 @@ class ProjectFactory(BaseModelFactory):
     user = factory.SubFactory(UserFactory)
     title = factory.Sequence(lambda n: 'new title for project {}'.format(n))
     slug = factory.Sequence(lambda n: 'new-title-for-project-{}'.format(n))
+    color = factory.Sequence(lambda n: 'color-{}'.format(n))
 
     class Meta:
         model = Project
\ No newline at end of file
@@ -13,6 +13,8 @@ class TaskFactory(BaseModelFactory):
     slug = factory.Sequence(lambda n: 'task-{}'.format(n))
     description = fake.text()
     project = factory.SubFactory(ProjectFactory)
+    # Task.save() derives it too, but create_bulk skips save()
+    owner = factory.SelfAttribute('project.user')
 
     class Meta:
         model = Task
\ No newline at end of file
@@ -1,8 +1,11 @@
 import uuid
+from functools import lru_cache
+
 import factory
 from faker import Faker
 
 from django.conf import settings
+from django.contrib.auth.hashers import make_password
 from .factories_common import BaseModelFactory
 
 
@@ -14,7 +17,18 @@ fake = Faker()
 class UserFactory(BaseModelFactory):
     username = factory.Sequence(lambda n: 'username_{}'.format(n))
     email = factory.Sequence(lambda n: 'email{}gmail.com'.format(n))
-    password = factory.PostGenerationMethodCall('set_password', TEST_USER_PASSWORD)
+    password = TEST_USER_PASSWORD
 
     class Meta:
-        model = User
\ No newline at end of file
+        model = User
+
+    @classmethod
+    def _adjust_kwargs(cls, **kwargs):
+        kwargs['password'] = password_hash(kwargs['password'])
+        return kwargs
+
+
+@lru_cache(maxsize=None)
+def password_hash(raw_password):
+    # one PBKDF2 run per distinct password instead of one per user
+    return make_password(raw_password)
\ No newline at end of file
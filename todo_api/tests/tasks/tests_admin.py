@@ -0,0 +1,73 @@
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from tests.factories_projects import ProjectFactory
+from tests.factories_tasks import TaskFactory
+from tests.factories_users import UserFactory
+
+from tasks.models import Task
+from tasks.pagination import EstimatedCountPaginator
+
+
+class TaskAdminTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.client = Client()
+        cls.admin = UserFactory(is_staff=True, is_superuser=True)
+        cls.pr = ProjectFactory()
+        cls.url = reverse('admin:tasks_task_changelist')
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+        self.client.get(self.url)  # cache the admin user
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(context)
+
+    def test_changelist_queries_do_not_grow_with_rows(self):
+        TaskFactory(project=self.pr)
+        few = self.count_queries(self.url)
+        for i in range(5):
+            TaskFactory(project=ProjectFactory())
+        self.assertEqual(self.count_queries(self.url), few)
+
+    def test_owner_filter(self):
+        TaskFactory(project=self.pr)
+        TaskFactory(project=ProjectFactory())
+        response = self.client.get(self.url, {'owner_email': self.pr.user.email})
+        self.assertEqual([task.owner_id for task in response.context['cl'].result_list], [self.pr.user_id])
+        self.assertContains(response, 'name="owner_email"')
+
+    def test_project_changelist_user_filter(self):
+        other = ProjectFactory()
+        response = self.client.get(reverse('admin:tasks_project_changelist'), {'user_email': other.user.email})
+        self.assertEqual(list(response.context['cl'].result_list), [other])
+
+
+class EstimatedCountPaginatorTestCase(TestCase):
+
+    def test_exact_count_on_sqlite(self):
+        TaskFactory.create_batch(3)
+        paginator = EstimatedCountPaginator(Task.objects.all(), 2)
+        self.assertIsNone(paginator.estimated_count())
+        self.assertEqual(paginator.count, 3)
+
+    def test_large_estimate_is_used(self):
+        paginator = EstimatedCountPaginator(Task.objects.all(), 100)
+        with mock.patch.object(EstimatedCountPaginator, 'estimated_count', return_value=2000000), \
+                self.assertNumQueries(0):
+            self.assertEqual(paginator.num_pages, 20000)
+
+    def test_small_estimate_is_counted(self):
+        TaskFactory()
+        paginator = EstimatedCountPaginator(Task.objects.all(), 100)
+        with mock.patch.object(EstimatedCountPaginator, 'estimated_count', return_value=50):
+            self.assertEqual(paginator.count, 1)
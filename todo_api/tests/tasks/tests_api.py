@@ -0,0 +1,205 @@
+import json
+
+from django.db import connection
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from tests.factories_projects import ProjectFactory
+from tests.factories_tasks import TaskFactory
+from tests.factories_users import UserFactory
+from tests.utils_queries import QueryBudgetMixin
+
+from tasks.models import Project, Task
+
+
+class ProjectApiTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.client = Client()
+        cls.user = UserFactory()
+        cls.pr = ProjectFactory(user=cls.user, title='alpha', color='red')
+        ProjectFactory(title='foreign')
+        cls.url = reverse('tasks:api_project_list')
+
+    def test_login_required(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 401)
+
+    def test_list(self):
+        self.client.force_login(self.user)
+        data = self.client.get(self.url).json()
+        self.assertEqual(data['results'], [{'id': self.pr.id, 'title': 'alpha', 'slug': self.pr.slug, 'color': 'red'}])
+        self.assertIsNone(data['next'])
+
+    def test_create(self):
+        self.client.force_login(self.user)
+        response = self.client.post(self.url, json.dumps({'title': 'beta', 'color': 'blue'}),
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Project.objects.get(slug=response.json()['slug']).user, self.user)
+
+    def test_create_invalid(self):
+        self.client.force_login(self.user)
+        response = self.client.post(self.url, json.dumps({'title': 'alpha', 'color': 'blue'}),
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('title', response.json()['errors'])
+
+    def test_invalid_json(self):
+        self.client.force_login(self.user)
+        response = self.client.post(self.url, '{', content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_detail_and_patch(self):
+        self.client.force_login(self.user)
+        url = reverse('tasks:api_project_detail', args=[self.pr.slug])
+        self.assertEqual(self.client.get(url).json()['title'], 'alpha')
+
+        response = self.client.patch(url, json.dumps({'color': 'green'}), content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Project.objects.get(pk=self.pr.pk).color, 'green')
+
+    def test_detail_of_other_user(self):
+        self.client.force_login(UserFactory())
+        response = self.client.get(reverse('tasks:api_project_detail', args=[self.pr.slug]))
+        self.assertEqual(response.status_code, 404)
+
+
+class TaskApiTestCase(QueryBudgetMixin, TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.client = Client()
+        cls.user = UserFactory()
+        cls.pr = ProjectFactory(user=cls.user)
+        cls.url = reverse('tasks:api_task_list')
+
+    def test_list_is_paginated(self):
+        TaskFactory.create_batch(55, project=self.pr)
+        self.client.force_login(self.user)
+        with self.assertQueryBudget(3):
+            data = self.client.get(self.url).json()
+        self.assertEqual(len(data['results']), 50)
+        self.assertEqual(data['results'][0]['project_slug'], self.pr.slug)
+
+        data = self.client.get(self.url, {'cursor': data['next']}).json()
+        self.assertEqual(len(data['results']), 5)
+        self.assertIsNone(data['next'])
+
+    def test_create(self):
+        self.client.force_login(self.user)
+        response = self.client.post(self.url, json.dumps({'title': 'write tests', 'project': self.pr.slug}),
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        task = Task.objects.get(slug=response.json()['slug'])
+        self.assertEqual(task.owner, self.user)
+        self.assertEqual(task.priority, Task.HIGN)
+
+    def test_create_in_foreign_project(self):
+        self.client.force_login(self.user)
+        response = self.client.post(self.url, json.dumps({'title': 'x', 'project': ProjectFactory().slug}),
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('project', response.json()['errors'])
+
+    def test_update(self):
+        task = TaskFactory(project=self.pr)
+        self.client.force_login(self.user)
+        url = reverse('tasks:api_task_detail', args=[task.slug])
+        response = self.client.put(url, json.dumps({'status': Task.COMPLETED}), content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Task.objects.get(pk=task.pk).status, Task.COMPLETED)
+        self.assertEqual(self.client.get(url).json()['status'], Task.COMPLETED)
+
+    def test_create_duplicate_title(self):
+        self.client.force_login(self.user)
+        data = json.dumps({'title': 'dup', 'project': self.pr.slug})
+        first = self.client.post(self.url, data, content_type='application/json')
+        second = self.client.post(self.url, data, content_type='application/json')
+        self.assertEqual(second.status_code, 201)
+        self.assertEqual(second.json()['slug'], first.json()['slug'] + '-2')
+
+    def test_update_to_existing_title(self):
+        TaskFactory(project=self.pr, title='dup')
+        task = TaskFactory(project=self.pr, title='other')
+        self.client.force_login(self.user)
+        url = reverse('tasks:api_task_detail', args=[task.slug])
+        response = self.client.put(url, json.dumps({'title': 'dup'}), content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()['slug'].endswith('-2'))
+        # an unrelated update keeps the suffixed slug
+        url = reverse('tasks:api_task_detail', args=[response.json()['slug']])
+        response = self.client.put(url, json.dumps({'status': Task.COMPLETED}), content_type='application/json')
+        self.assertEqual(response.json()['slug'], Task.objects.get(pk=task.pk).slug)
+        self.assertTrue(response.json()['slug'].endswith('-2'))
+
+
+class TaskApiBulkTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.client = Client()
+        cls.user = UserFactory()
+        cls.pr = ProjectFactory(user=cls.user)
+        cls.pr2 = ProjectFactory(user=cls.user)
+        cls.tasks = [TaskFactory(project=cls.pr, priority=Task.LOW) for i in range(4)]
+        cls.foreign = TaskFactory(project=ProjectFactory())
+        cls.url = reverse('tasks:api_task_bulk')
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def post(self, data):
+        return self.client.post(self.url, json.dumps(data), content_type='application/json')
+
+    def test_complete_by_ids(self):
+        ids = [task.pk for task in self.tasks[:3]] + [self.foreign.pk]
+        with CaptureQueriesContext(connection) as context:
+            response = self.post({'action': 'complete', 'ids': ids})
+        self.assertEqual(response.json(), {'action': 'complete', 'updated': 3})
+        updates = [query for query in context.captured_queries if query['sql'].startswith('UPDATE "tasks_task"')]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(Task.objects.get(pk=self.foreign.pk).status, Task.UNCOMPLETED)
+        pr = Project.objects.get(pk=self.pr.pk)
+        self.assertEqual((pr.task_count, pr.completed_count), (4, 3))
+        # already completed rows are left alone
+        self.assertEqual(self.post({'action': 'complete', 'ids': ids}).json()['updated'], 0)
+
+    def test_modified_is_updated(self):
+        before = Task.objects.get(pk=self.tasks[0].pk).modified
+        self.post({'action': 'reprioritize', 'ids': [self.tasks[0].pk], 'priority': Task.HIGN})
+        task = Task.objects.get(pk=self.tasks[0].pk)
+        self.assertEqual(task.priority, Task.HIGN)
+        self.assertGreater(task.modified, before)
+        self.assertEqual(Task.objects.get(pk=self.tasks[1].pk).modified, self.tasks[1].modified)
+
+    def test_move_by_filter(self):
+        response = self.post({'action': 'move', 'filter': {'project': self.pr.slug}, 'project': self.pr2.slug})
+        self.assertEqual(response.json()['updated'], 4)
+        pr, pr2 = Project.objects.get(pk=self.pr.pk), Project.objects.get(pk=self.pr2.pk)
+        self.assertEqual((pr.task_count, pr2.task_count), (0, 4))
+
+    def test_move_to_foreign_project(self):
+        response = self.post({'action': 'move', 'ids': [self.tasks[0].pk], 'project': self.foreign.project.slug})
+        self.assertEqual(response.status_code, 400)
+
+    def test_delete(self):
+        response = self.post({'action': 'delete', 'filter': {'priority': Task.LOW}})
+        self.assertEqual(response.json(), {'action': 'delete', 'deleted': 4})
+        self.assertTrue(Task.objects.filter(pk=self.foreign.pk).exists())
+        self.assertEqual(Project.objects.get(pk=self.pr.pk).task_count, 0)
+
+    def test_bad_requests(self):
+        self.assertEqual(self.post({'action': 'archive', 'ids': []}).status_code, 400)
+        self.assertEqual(self.post({'action': 'complete'}).status_code, 400)
+        self.assertEqual(self.post({'action': 'complete', 'ids': ['1']}).status_code, 400)
+        self.assertEqual(self.post({'action': 'complete', 'filter': {'owner': 1}}).status_code, 400)
+        self.assertEqual(self.post({'action': 'reprioritize', 'ids': [], 'priority': 7}).status_code, 400)
+        self.assertEqual(self.post({'action': 'reprioritize', 'ids': [], 'priority': [1]}).status_code, 400)
+        self.assertEqual(self.post({'action': 'reprioritize', 'ids': [], 'priority': True}).status_code, 400)
+        self.assertEqual(self.post({'action': 'complete', 'ids': [True]}).status_code, 400)
+        self.assertEqual(self.post({'action': 'complete', 'filter': {'status': False}}).status_code, 400)
+        self.assertEqual(self.post({'action': 'complete', 'filter': {'project': {'a': 1}}}).status_code, 400)
+        self.assertEqual(self.post({'action': 'move', 'ids': [], 'project': ['x']}).status_code, 400)
@@ -0,0 +1,219 @@
+from django.core.cache import cache
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+from django.utils.http import http_date
+from django.utils.translation import activate
+
+from tests.factories_projects import ProjectFactory
+from tests.factories_tasks import TaskFactory
+from tests.factories_users import UserFactory
+from tests.utils_queries import cached_auth
+
+from tasks.cache import get_project_list_version, project_list_stats
+from tasks import jobs
+from tasks.deletion import purge_project, schedule_deletion
+from tasks.models import Project, Task
+from users.models import User
+
+
+@cached_auth
+class ProjectListCacheTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.client = Client()
+        cls.user = UserFactory()
+        cls.pr = ProjectFactory(user=cls.user, title='first')
+        cls.url = reverse('tasks:project_list')
+
+    def setUp(self):
+        cache.clear()
+
+    def titles(self):
+        response = self.client.get(self.url)
+        return [project.title for project in response.context['object_list']]
+
+    def test_second_request_is_served_from_cache(self):
+        self.client.force_login(self.user)
+        self.assertEqual(self.titles(), ['first'])
+        # session and user come from the cache too, the ETag's aggregate is
+        # the only query
+        with self.assertNumQueries(1):
+            self.assertEqual(self.titles(), ['first'])
+        self.assertEqual(project_list_stats(), {'hits': 1, 'misses': 1, 'hit_ratio': 0.5})
+
+    def test_create_invalidates(self):
+        self.client.force_login(self.user)
+        self.titles()
+        ProjectFactory(user=self.user, title='second')
+        self.assertEqual(self.titles(), ['first', 'second'])
+
+    def test_delete_invalidates(self):
+        self.client.force_login(self.user)
+        self.titles()
+        Project.objects.get(pk=self.pr.pk).delete()
+        self.assertEqual(self.titles(), [])
+
+    @override_settings(PROJECT_DELETE_BATCH_SIZE=0)
+    def test_purge_by_worker_invalidates(self):
+        TaskFactory(project=self.pr)
+        self.client.force_login(self.user)
+        self.client.post(reverse('tasks:project_delete', args=[self.pr.slug]))
+        self.assertEqual(self.titles(), ['first'])
+        # the worker runs with a cache of its own, as with LocMemCache
+        with override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                                                   'LOCATION': 'worker'}}):
+            self.assertTrue(jobs.run(jobs.claim('w1')))
+        self.assertEqual(self.titles(), [])
+
+    def test_reassign_invalidates_both_users(self):
+        user2 = UserFactory()
+        version = get_project_list_version(self.user.pk)
+        version2 = get_project_list_version(user2.pk)
+        pr = Project.objects.get(pk=self.pr.pk)
+        pr.user = user2
+        pr.save()
+        self.assertNotEqual(get_project_list_version(self.user.pk), version)
+        self.assertNotEqual(get_project_list_version(user2.pk), version2)
+
+    def test_other_users_are_not_invalidated(self):
+        user2 = UserFactory()
+        version = get_project_list_version(self.user.pk)
+        ProjectFactory(user=user2)
+        self.assertEqual(get_project_list_version(self.user.pk), version)
+
+    def test_evicted_version_does_not_go_back(self):
+        version = get_project_list_version(self.user.pk)
+        cache.delete('projects:version:{}'.format(self.user.pk))
+        self.assertGreaterEqual(get_project_list_version(self.user.pk), version)
+
+    def test_stats_view(self):
+        url = reverse('tasks:project_cache_stats')
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(url).status_code, 403)
+        self.client.force_login(UserFactory(is_staff=True))
+        self.assertEqual(self.client.get(url).json()['hits'], 0)
+
+
+class BaseTemplateFragmentCacheTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_language_selector_per_language(self):
+        for language in ('en', 'ru', 'en'):
+            response = self.client.get('/{}/'.format(language))
+            self.assertContains(response, '<option value="{}" selected>'.format(language))
+            self.assertContains(response, '/{}/users/login/'.format(language))
+
+    def test_navigation_per_auth_state(self):
+        self.client.get('/en/')
+        user = UserFactory()
+        self.client.force_login(user)
+        response = self.client.get('/en/')
+        self.assertContains(response, '<span>{}</span>'.format(user.email))
+
+
+@cached_auth
+class ConditionalGetTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.client = Client()
+        cls.user = UserFactory()
+        cls.pr = ProjectFactory(user=cls.user, title='first')
+        cls.task = TaskFactory(project=cls.pr)
+        cls.task_url = reverse('tasks:task_list')
+        cls.project_url = reverse('tasks:project_list')
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def revalidate(self, url):
+        etag = self.client.get(url)['ETag']
+        return self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    def test_task_list_not_modified(self):
+        response = self.client.get(self.task_url)
+        self.assertEqual(response['Last-Modified'], http_date(self.task.modified.timestamp()))
+        self.assertIn('private', response['Cache-Control'])
+        # the aggregate only; no page query, no rendering
+        with self.assertNumQueries(1):
+            response = self.client.get(self.task_url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+    def test_task_list_changes(self):
+        etag = self.client.get(self.task_url)['ETag']
+        TaskFactory(project=self.pr)
+        self.assertEqual(self.client.get(self.task_url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+        etag = self.client.get(self.task_url)['ETag']
+        Task.objects.filter(pk=self.task.pk).delete()
+        self.assertEqual(self.client.get(self.task_url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+        etag = self.client.get(self.task_url)['ETag']
+        Project.objects.get(pk=self.pr.pk).save()
+        self.assertEqual(self.client.get(self.task_url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+        # the page header shows the username
+        etag = self.client.get(self.task_url)['ETag']
+        user = User.objects.get(pk=self.user.pk)
+        user.username = 'renamed'
+        user.save()
+        self.assertEqual(self.client.get(self.task_url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+        etag = self.client.get(self.task_url)['ETag']
+        user.email = 'renamed@example.com'
+        user.save()
+        self.assertEqual(self.client.get(self.task_url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_task_list_varies_by_cursor_and_language(self):
+        etag = self.client.get(self.task_url)['ETag']
+        response = self.client.get(self.task_url + '?cursor=x', HTTP_IF_NONE_MATCH=etag)
+        self.assertNotEqual(response.status_code, 304)
+        # the request activates the language for the rest of the thread
+        self.addCleanup(activate, 'en')
+        response = self.client.get(self.task_url.replace('/en/', '/ru/', 1), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_project_list_not_modified(self):
+        response = self.client.get(self.project_url)
+        # the aggregate only
+        with self.assertNumQueries(1):
+            response = self.client.get(self.project_url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_project_deletion_changes_project_list(self):
+        etag = self.client.get(self.project_url)['ETag']
+        schedule_deletion(Project.objects.get(pk=self.pr.pk))
+        self.assertEqual(self.client.get(self.project_url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    @override_settings(PROJECT_DELETE_BATCH_SIZE=0)
+    def test_project_deleted_by_another_process(self):
+        self.client.post(reverse('tasks:project_delete', args=[self.pr.slug]))
+        # takes the message
+        self.client.get(self.project_url)
+        etag = self.client.get(self.project_url)['ETag']
+        # the worker runs with a cache of its own, as with LocMemCache
+        with override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                                                   'LOCATION': 'worker'}}):
+            self.assertTrue(jobs.run(jobs.claim('w1')))
+        response = self.client.get(self.project_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(Project.objects.exists())
+
+        TaskFactory(project=ProjectFactory(user=self.user))
+        etag = self.client.get(self.project_url)['ETag']
+        with override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                                                   'LOCATION': 'purge'}}):
+            project = Project.objects.get()
+            schedule_deletion(project)
+            purge_project(project)
+        self.assertEqual(self.client.get(self.project_url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_pending_message_is_not_swallowed(self):
+        etag = self.revalidate(self.project_url)['ETag']
+        self.client.post(reverse('tasks:project_create'), {'title': 'second', 'color': 'dark'})
+        response = self.client.get(self.project_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertContains(response, 'Success: Project was created.')
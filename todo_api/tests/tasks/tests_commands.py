@@ -0,0 +1,165 @@
+import json
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection, connections
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from tests.factories_projects import ProjectFactory
+from tests.factories_tasks import TaskFactory
+from tests.factories_users import UserFactory, TEST_USER_PASSWORD
+
+from tasks.models import Project, Task
+from tasks.signals import check_connections, mark_connections_used
+from users.models import User
+
+
+class ExplainQueriesCommandTestCase(TestCase):
+
+    def test_no_users(self):
+        with self.assertRaises(CommandError):
+            call_command('explain_queries', stdout=StringIO())
+
+    def test_plans_use_task_indexes(self):
+        pr = ProjectFactory()
+        TaskFactory.create_batch(3, project=pr)
+        out = StringIO()
+        call_command('explain_queries', user=pr.user.email, stdout=out)
+        self.assertIn('TaskListView', out.getvalue())
+        self.assertIn('task_project_status_idx', out.getvalue())
+        self.assertIn('task_project_created_idx', out.getvalue())
+
+
+class BenchTemplatesCommandTestCase(TestCase):
+
+    def test_reports_both_profiles(self):
+        out = StringIO()
+        call_command('bench_templates', iterations=4, stdout=out)
+        self.assertIn('before', out.getvalue())
+        self.assertIn('after', out.getvalue())
+
+
+class BenchConnectionsCommandTestCase(TestCase):
+
+    def test_reports_both_profiles(self):
+        out = StringIO()
+        call_command('bench_connections', requests=5, stdout=out)
+        self.assertIn('no reuse', out.getvalue())
+        self.assertIn('per request', out.getvalue())
+        self.assertEqual(connection.settings_dict['CONN_MAX_AGE'], 0)
+
+
+class ConnectionHealthCheckTestCase(TestCase):
+
+    def setUp(self):
+        connection.ensure_connection()
+        # earlier requests marked the shared connection as used
+        vars(connections['default']).pop('health_check_last_used', None)
+
+    def check(self, enabled, usable):
+        with mock.patch.dict(connection.settings_dict, CONN_HEALTH_CHECKS=enabled), \
+                mock.patch.object(connection, 'is_usable', return_value=usable) as is_usable, \
+                mock.patch.object(connection, 'close') as close:
+            check_connections()
+        self.is_usable = is_usable
+        return close.called
+
+    def test_unusable_connection_is_closed(self):
+        self.assertTrue(self.check(enabled=True, usable=False))
+
+    def test_usable_connection_is_kept(self):
+        self.assertFalse(self.check(enabled=True, usable=True))
+
+    def test_disabled(self):
+        self.assertFalse(self.check(enabled=False, usable=False))
+
+    def test_recently_used_connection_is_not_pinged(self):
+        mark_connections_used()
+        self.assertFalse(self.check(enabled=True, usable=False))
+        self.assertFalse(self.is_usable.called)
+
+    def test_idle_connection_is_pinged(self):
+        mark_connections_used()
+        connection.health_check_last_used -= 60
+        self.assertTrue(self.check(enabled=True, usable=False))
+
+
+class BenchViewsCommandTestCase(TestCase):
+
+    def run_bench(self, **options):
+        out = StringIO()
+        call_command('bench_views', users=1, projects=1, tasks=2, requests=1, in_place=True,
+                     stdout=out, stderr=StringIO(), **options)
+        return out.getvalue()
+
+    def test_every_view_is_timed(self):
+        with tempfile.NamedTemporaryFile('r', suffix='.json') as baseline:
+            out = self.run_bench(save_baseline=baseline.name)
+            results = json.load(baseline)
+        self.assertIn('tasks:task_list', out)
+        self.assertIn('users:login', out)
+        self.assertEqual(results['tasks:api_task_detail']['status'], 200)
+        self.assertEqual(results['users:logout']['status'], 302)
+
+    def test_query_regression_fails(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.json') as baseline:
+            json.dump({'tasks:task_list': {'queries': 0, 'p95': 1000000}}, baseline)
+            baseline.flush()
+            with self.assertRaises(CommandError):
+                self.run_bench(baseline=baseline.name)
+
+
+class SeedDataCommandTestCase(TestCase):
+
+    def test_seed(self):
+        out = StringIO()
+        with CaptureQueriesContext(connection) as context:
+            call_command('seed_data', users=2, projects=3, tasks=4, stdout=out)
+        self.assertIn('2 users, 6 projects, 24 tasks', out.getvalue())
+        self.assertEqual(User.objects.count(), 2)
+        self.assertEqual(len(set(User.objects.values_list('password', flat=True))), 1)
+        self.assertTrue(User.objects.first().check_password('seed-password'))
+        project = Project.objects.first()
+        self.assertEqual((project.task_count, project.completed_count), (4, 2))
+        self.assertTrue(all(task.owner_id == task.project.user_id for task in Task.objects.select_related('project')))
+        self.assertLess(len(context), 20)
+        # the slug Task.save would give
+        task = Task.objects.select_related('owner').first()
+        self.assertEqual(task.slug, Task.slug_base(task.title, task.owner.username))
+
+
+class FactoryBulkModeTestCase(TestCase):
+
+    def test_create_bulk(self):
+        pr = ProjectFactory()
+        TaskFactory.create_bulk(1, project=pr)  # sets up the factory sequence
+        # insert, counter update, list cache version bump
+        with self.assertNumQueries(3):
+            TaskFactory.create_bulk(10, project=pr)
+        pr.refresh_from_db()
+        self.assertEqual(pr.task_count, 11)
+        self.assertEqual(Task.objects.filter(owner=pr.user).count(), 11)
+
+    def test_users_share_one_hash(self):
+        UserFactory.create_bulk(3)
+        self.assertEqual(len(set(User.objects.values_list('password', flat=True))), 1)
+        self.assertTrue(User.objects.first().check_password(TEST_USER_PASSWORD))
+
+
+class PurgeProjectsCommandTestCase(TestCase):
+
+    def test_purges_scheduled_projects(self):
+        scheduled = ProjectFactory()
+        kept = ProjectFactory()
+        TaskFactory.create_batch(3, project=scheduled)
+        TaskFactory.create_batch(2, project=kept)
+        Project.objects.filter(pk=scheduled.pk).update(deleting=True)
+        out = StringIO()
+        call_command('purge_projects', batch_size=2, stdout=out)
+        self.assertIn(f'Deleted project {scheduled.pk} and 3 tasks.', out.getvalue())
+        self.assertEqual(list(Project.objects.values_list('pk', flat=True)), [kept.pk])
+        self.assertEqual(Task.objects.count(), 2)
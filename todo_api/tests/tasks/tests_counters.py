@@ -0,0 +1,100 @@
+import io
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from tests.factories_projects import ProjectFactory
+from tests.factories_tasks import TaskFactory
+from tests.factories_users import UserFactory
+
+from tasks.importers import CSV, import_tasks, read_rows
+from tasks.models import Project, Task
+
+
+class ProjectCountersTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+        cls.pr = ProjectFactory(user=cls.user)
+        cls.pr2 = ProjectFactory(user=cls.user)
+
+    def assertCounts(self, project, tasks, completed):
+        project = Project.objects.get(pk=project.pk)
+        self.assertEqual((project.task_count, project.completed_count), (tasks, completed))
+
+    def test_create(self):
+        TaskFactory.create_batch(3, project=self.pr)
+        TaskFactory(project=self.pr, status=Task.COMPLETED)
+        self.assertCounts(self.pr, 4, 1)
+
+    def test_saving_a_stale_project_keeps_counters(self):
+        TaskFactory.create_batch(2, project=self.pr)
+        stale = Project.objects.get(pk=self.pr.pk)
+        TaskFactory(project=self.pr, status=Task.COMPLETED)
+        stale.title = 'renamed'
+        stale.save()
+        self.assertCounts(self.pr, 3, 1)
+        self.assertEqual(Project.objects.get(pk=self.pr.pk).title, 'renamed')
+
+    def test_saving_a_new_project_with_a_pk(self):
+        ProjectFactory.build(pk=999, user=self.user).save()
+        self.assertCounts(Project(pk=999), 0, 0)
+
+    def test_status_change(self):
+        task = TaskFactory(project=self.pr)
+        task = Task.objects.get(pk=task.pk)
+        task.status = Task.COMPLETED
+        task.save()
+        self.assertCounts(self.pr, 1, 1)
+        task.title = 'renamed'
+        task.save()
+        self.assertCounts(self.pr, 1, 1)
+        task.status = Task.UNCOMPLETED
+        task.save()
+        self.assertCounts(self.pr, 1, 0)
+
+    def test_move_to_other_project(self):
+        task = TaskFactory(project=self.pr, status=Task.COMPLETED)
+        task = Task.objects.get(pk=task.pk)
+        task.project = self.pr2
+        task.save()
+        self.assertCounts(self.pr, 0, 0)
+        self.assertCounts(self.pr2, 1, 1)
+
+    def test_delete(self):
+        task = TaskFactory(project=self.pr, status=Task.COMPLETED)
+        TaskFactory(project=self.pr)
+        Task.objects.get(pk=task.pk).delete()
+        self.assertCounts(self.pr, 1, 0)
+
+    def test_bulk_update(self):
+        TaskFactory.create_batch(3, project=self.pr)
+        Task.objects.filter(project=self.pr).update(status=Task.COMPLETED)
+        self.assertCounts(self.pr, 3, 3)
+        Task.objects.filter(project=self.pr).update(project=self.pr2)
+        self.assertCounts(self.pr, 0, 0)
+        self.assertCounts(self.pr2, 3, 3)
+        Task.objects.filter(project=self.pr2).update(project=self.pr.pk)
+        self.assertCounts(self.pr, 3, 3)
+        self.assertCounts(self.pr2, 0, 0)
+
+    def test_bulk_update_to_other_user_keeps_owner(self):
+        other = ProjectFactory()
+        TaskFactory.create_batch(2, project=self.pr)
+        Task.objects.filter(project=self.pr).update(project=other)
+        self.assertEqual(set(Task.objects.values_list('owner_id', flat=True)), {other.user_id})
+
+    def test_bulk_create(self):
+        data = 'title,status\na,1\nb,0\nc,\n'
+        import_tasks(read_rows(io.StringIO(data), CSV), Project.objects.get(pk=self.pr.pk))
+        self.assertCounts(self.pr, 3, 1)
+
+    def test_recount_command(self):
+        TaskFactory.create_batch(2, project=self.pr, status=Task.COMPLETED)
+        Project.objects.update(task_count=42, completed_count=7)
+        out = io.StringIO()
+        call_command('recount', stdout=out)
+        self.assertIn('Recounted 2 projects', out.getvalue())
+        self.assertCounts(self.pr, 2, 2)
+        self.assertCounts(self.pr2, 0, 0)
@@ -0,0 +1,78 @@
+import csv
+import gzip
+import io
+import json
+
+from django.test import TestCase, Client
+from django.urls import reverse
+
+from tests.factories_projects import ProjectFactory
+from tests.factories_tasks import TaskFactory
+from tests.factories_users import UserFactory
+
+from tasks.exporters import encoded
+from tasks.importers import CSV, import_tasks, read_rows
+from tasks.models import Task
+
+
+class TaskExportViewTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.client = Client()
+        cls.user = UserFactory()
+        cls.pr = ProjectFactory(user=cls.user)
+        TaskFactory.create_batch(3, project=cls.pr)
+        TaskFactory.create_batch(2, project=ProjectFactory())
+        cls.url = reverse('tasks:task_export')
+
+    def get_content(self, response):
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content)
+
+    def test_login_required(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 302)
+
+    def test_csv(self):
+        self.client.force_login(self.user)
+        response = self.client.get(self.url)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertIn('tasks.csv', response['Content-Disposition'])
+        rows = list(csv.DictReader(io.StringIO(self.get_content(response).decode())))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[0]['project'], self.pr.title)
+
+    def test_csv_can_be_imported_back(self):
+        self.client.force_login(self.user)
+        content = self.get_content(self.client.get(self.url)).decode()
+        result = import_tasks(read_rows(io.StringIO(content), CSV), self.pr)
+        self.assertEqual(result.rows, 3)
+        self.assertEqual(Task.objects.filter(project=self.pr).count(), 6)
+
+    def test_ndjson(self):
+        self.client.force_login(self.user)
+        response = self.client.get(self.url, {'format': 'ndjson'})
+        lines = self.get_content(response).decode().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(json.loads(lines[0])['project'], self.pr.title)
+
+    def test_gzip(self):
+        self.client.force_login(self.user)
+        response = self.client.get(self.url, {'format': 'ndjson', 'gzip': '1'})
+        self.assertEqual(response['Content-Type'], 'application/gzip')
+        lines = gzip.decompress(self.get_content(response)).decode().splitlines()
+        self.assertEqual(len(lines), 3)
+
+    def test_unknown_format(self):
+        self.client.force_login(self.user)
+        response = self.client.get(self.url, {'format': 'xml'})
+        self.assertEqual(response.status_code, 404)
+
+
+class EncodedTestCase(TestCase):
+
+    def test_chunks(self):
+        chunks = list(encoded(['ab', 'cd', 'e'], size=4))
+        self.assertEqual(chunks, [b'abcd', b'e'])
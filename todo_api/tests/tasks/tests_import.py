@@ -0,0 +1,129 @@
+import io
+import tempfile
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from tests.factories_projects import ProjectFactory
+from tests.factories_tasks import TaskFactory
+from tests.factories_users import UserFactory
+
+from tasks.importers import CSV, JSONL, TaskImportError, import_tasks, read_rows
+from tasks.models import Task
+
+
+CSV_DATA = 'title,description,priority,status\nfirst,one,1,0\nsecond,,-1,1\nfirst,dup,,\n'
+JSONL_DATA = '{"title": "first"}\n\n{"title": "second", "priority": 0, "status": 1}\n'
+
+
+class ImportTasksTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory(username='bob')
+        cls.pr = ProjectFactory(user=cls.user)
+
+    def test_csv(self):
+        result = import_tasks(read_rows(io.StringIO(CSV_DATA), CSV), self.pr, batch_size=2)
+        self.assertEqual(result.rows, 3)
+        tasks = Task.objects.order_by('id')
+        self.assertEqual([t.slug for t in tasks], ['first-bob', 'second-bob', 'first-bob-2'])
+        self.assertEqual(tasks[1].priority, Task.LOW)
+        self.assertEqual(tasks[1].status, Task.COMPLETED)
+        self.assertEqual(tasks[2].priority, Task.HIGN)
+        self.assertTrue(all(t.owner_id == self.user.id for t in tasks))
+
+    def test_jsonl(self):
+        result = import_tasks(read_rows(io.StringIO(JSONL_DATA), JSONL), self.pr)
+        self.assertEqual(result.rows, 2)
+        self.assertEqual(Task.objects.get(slug='second-bob').status, Task.COMPLETED)
+
+    def test_slugs_dont_clash_with_existing_tasks(self):
+        import_tasks(read_rows(io.StringIO(CSV_DATA), CSV), self.pr)
+        import_tasks(read_rows(io.StringIO(CSV_DATA), CSV), self.pr)
+        self.assertEqual(Task.objects.filter(slug__startswith='first-bob').count(), 4)
+        self.assertTrue(Task.objects.filter(slug='first-bob-4').exists())
+
+    def test_batches_written_in_few_queries(self):
+        rows = ''.join('{{"title": "task {}"}}\n'.format(i) for i in range(50))
+        with CaptureQueriesContext(connection) as context:
+            import_tasks(read_rows(io.StringIO(rows), JSONL), self.pr, batch_size=10)
+        inserts = [q for q in context.captured_queries if q['sql'].startswith('INSERT')]
+        self.assertEqual(len(inserts), 5)
+        self.assertEqual(Task.objects.count(), 50)
+
+    def test_invalid_row(self):
+        data = 'title,priority\nok,1\nbad,7\n'
+        with self.assertRaisesMessage(TaskImportError, 'Line 3: Invalid priority'):
+            import_tasks(read_rows(io.StringIO(data), CSV), self.pr)
+
+    def test_non_string_fields(self):
+        with self.assertRaisesMessage(TaskImportError, 'Line 2: Title must be a string.'):
+            import_tasks(read_rows(io.StringIO('{"title": "ok"}\n{"title": 123}\n'), JSONL), self.pr)
+        with self.assertRaisesMessage(TaskImportError, 'Line 1: Description must be a string.'):
+            import_tasks(read_rows(io.StringIO('{"title": "ok", "description": ["x"]}\n'), JSONL), self.pr)
+
+    def test_long_title_slug_fits(self):
+        title = 'x' * 255
+        import_tasks(read_rows(io.StringIO(f'{{"title": "{title}"}}\n' * 2), JSONL), self.pr)
+        max_length = Task._meta.get_field('slug').max_length
+        slugs = sorted(Task.objects.filter(project=self.pr).values_list('slug', flat=True))
+        self.assertTrue(all(len(slug) <= max_length for slug in slugs))
+        self.assertEqual(slugs[1], slugs[0] + '-2')
+        # the same slug Task.save would give the title
+        task = TaskFactory(project=self.pr, title=title)
+        self.assertEqual(task.slug, slugs[0] + '-3')
+
+
+class TaskImportViewTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.client = Client()
+        cls.user = UserFactory()
+        cls.pr = ProjectFactory(user=cls.user)
+        cls.other = ProjectFactory()
+        cls.url = reverse('tasks:task_import')
+
+    def test_upload(self):
+        self.client.force_login(self.user)
+        upload = SimpleUploadedFile('tasks.csv', CSV_DATA.encode())
+        response = self.client.post(self.url, {'project': self.pr.pk, 'file': upload})
+        self.assertRedirects(response, reverse('tasks:task_list'))
+        self.assertEqual(Task.objects.filter(project=self.pr).count(), 3)
+
+    def test_upload_error(self):
+        self.client.force_login(self.user)
+        upload = SimpleUploadedFile('tasks.jsonl', b'{"title": ""}\n')
+        response = self.client.post(self.url, {'project': self.pr.pk, 'file': upload})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Line 1: Title is required.')
+
+    def test_foreign_project(self):
+        self.client.force_login(self.user)
+        upload = SimpleUploadedFile('tasks.csv', CSV_DATA.encode())
+        response = self.client.post(self.url, {'project': self.other.pk, 'file': upload})
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(Task.objects.exists())
+
+
+class ImportTasksCommandTestCase(TestCase):
+
+    def test_command(self):
+        pr = ProjectFactory()
+        with tempfile.NamedTemporaryFile('w', suffix='.jsonl') as f:
+            f.write(JSONL_DATA)
+            f.flush()
+            out = io.StringIO()
+            call_command('import_tasks', f.name, project=pr.slug, stdout=out)
+        self.assertIn('Imported 2 tasks', out.getvalue())
+        self.assertEqual(Task.objects.filter(project=pr).count(), 2)
+
+    def test_unknown_project(self):
+        with self.assertRaises(CommandError):
+            call_command('import_tasks', '-', project='missing')
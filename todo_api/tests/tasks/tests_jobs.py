@@ -0,0 +1,135 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from tests.factories_projects import ProjectFactory
+from tests.factories_tasks import TaskFactory
+from tests.factories_users import UserFactory
+
+from tasks import jobs
+from tasks.deletion import schedule_deletion
+from tasks.models import Job, Project, Task
+
+
+calls = []
+
+
+def record(job, **payload):
+    calls.append((job.name, payload))
+
+
+def fail(job, **payload):
+    raise RuntimeError('boom')
+
+
+@mock.patch.dict(jobs.HANDLERS, {'record': record, 'fail': fail})
+class JobQueueTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+        cls.other = UserFactory()
+
+    def setUp(self):
+        calls.clear()
+
+    def test_enqueue_unknown_handler(self):
+        with self.assertRaises(ValueError):
+            jobs.enqueue('missing')
+
+    def test_claim_and_run(self):
+        job = jobs.enqueue('record', user=self.user, value=1)
+        claimed = jobs.claim('w1')
+        self.assertEqual((claimed.pk, claimed.status, claimed.attempts), (job.pk, Job.RUNNING, 1))
+        self.assertIsNone(jobs.claim('w2'))
+        self.assertTrue(jobs.run(claimed))
+        self.assertEqual(calls, [('record', {'value': 1})])
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.locked_until), (Job.DONE, None))
+
+    def test_failure_is_retried_with_backoff_then_failed(self):
+        job = jobs.enqueue('fail', max_attempts=2)
+        with self.assertLogs('tasks.jobs', 'ERROR'):
+            self.assertFalse(jobs.run(jobs.claim('w1')))
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.QUEUED)
+        self.assertIn('RuntimeError: boom', job.error)
+        self.assertGreater(job.run_after, timezone.now())
+        self.assertIsNone(jobs.claim('w1'))
+
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        with self.assertLogs('tasks.jobs', 'ERROR'):
+            self.assertFalse(jobs.run(jobs.claim('w1')))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.FAILED, 2))
+
+    def test_expired_lease_is_claimed_again(self):
+        job = jobs.enqueue('record')
+        first = jobs.claim('w1')
+        self.assertTrue(jobs.heartbeat(first))
+        Job.objects.filter(pk=job.pk).update(locked_until=timezone.now() - timedelta(seconds=1))
+        second = jobs.claim('w2')
+        self.assertEqual((second.locked_by, second.attempts), ('w2', 2))
+
+        # the first worker lost the job and can't finish or renew it
+        self.assertFalse(jobs.heartbeat(first))
+        jobs.run(first)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.locked_by), (Job.RUNNING, 'w2'))
+
+    def test_expired_last_attempt_fails(self):
+        job = jobs.enqueue('record', max_attempts=1)
+        jobs.claim('w1')
+        Job.objects.filter(pk=job.pk).update(locked_until=timezone.now() - timedelta(seconds=1))
+        self.assertIsNone(jobs.claim('w2'))
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.FAILED)
+
+    @override_settings(JOB_USER_CONCURRENCY=1)
+    def test_per_user_concurrency(self):
+        first = jobs.enqueue('record', user=self.user)
+        jobs.enqueue('record', user=self.user)
+        other = jobs.enqueue('record', user=self.other)
+        self.assertEqual(jobs.claim('w1').pk, first.pk)
+        self.assertEqual(jobs.claim('w2').pk, other.pk)
+        self.assertIsNone(jobs.claim('w3'))
+
+    def test_run_workers(self):
+        jobs.enqueue('record', value=1)
+        jobs.enqueue('record', value=2)
+        out = StringIO()
+        call_command('run_workers', threads=1, once=True, stdout=out)
+        self.assertIn('Ran 2 jobs.', out.getvalue())
+        self.assertEqual([payload['value'] for _, payload in calls], [1, 2])
+
+
+class DeleteProjectJobTestCase(TestCase):
+
+    @override_settings(PROJECT_DELETE_BATCH_SIZE=2)
+    def test_delete_project(self):
+        project = ProjectFactory()
+        TaskFactory.create_batch(5, project=project)
+        schedule_deletion(project)
+        job = jobs.enqueue('delete_project', user=project.user, project_id=project.pk)
+        call_command('run_workers', threads=1, once=True, stdout=StringIO())
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.DONE)
+        self.assertFalse(Project.objects.exists())
+        self.assertFalse(Task.objects.exists())
+
+    @override_settings(PROJECT_DELETE_BATCH_SIZE=2)
+    def test_lost_lease_stops_the_purge(self):
+        project = ProjectFactory()
+        TaskFactory.create_batch(5, project=project)
+        schedule_deletion(project)
+        jobs.enqueue('delete_project', user=project.user, project_id=project.pk)
+        job = jobs.claim('w1')
+        with mock.patch.object(jobs, 'heartbeat', return_value=False), self.assertLogs('tasks.jobs', 'WARNING'):
+            self.assertFalse(jobs.run(job))
+        self.assertEqual(Task.objects.count(), 3)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.error), (Job.RUNNING, ''))
@@ -0,0 +1,47 @@
+import json
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+
+from tests.factories_projects import ProjectFactory
+from tests.factories_tasks import TaskFactory
+
+
+class QueryTimingMiddlewareTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.pr = ProjectFactory()
+        TaskFactory.create_batch(2, project=cls.pr)
+        cls.url = reverse('tasks:task_list')
+
+    def setUp(self):
+        cache.clear()
+
+    def get(self):
+        client = Client()
+        client.force_login(self.pr.user)
+        return client.get(self.url)
+
+    @override_settings(QUERY_TIMING_SAMPLE_RATE=1.0)
+    def test_headers_and_log(self):
+        with self.assertLogs('tasks.query_timing', 'INFO') as logs:
+            response = self.get()
+        self.assertRegex(response['Server-Timing'], r'^db;dur=[\d.]+;desc="\d+ queries", db-slowest;dur=[\d.]+, '
+                                                    r'total;dur=[\d.]+$')
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record['view'], 'tasks:task_list')
+        self.assertEqual(record['status'], 200)
+        self.assertGreater(record['queries'], 0)
+        self.assertTrue(record['slowest_sql'].startswith('SELECT'))
+
+    @override_settings(QUERY_TIMING_SAMPLE_RATE=0)
+    def test_disabled(self):
+        self.assertFalse(self.get().has_header('Server-Timing'))
+
+    @override_settings(QUERY_TIMING_SAMPLE_RATE=0.1)
+    def test_not_sampled(self):
+        with mock.patch('tasks.middleware.random.random', return_value=0.5):
+            self.assertFalse(self.get().has_header('Server-Timing'))
@@ -0,0 +1,98 @@
+from django.core.cache import cache
+from django.test import TestCase, Client
+from django.urls import reverse
+from django.utils import timezone
+
+from tests.factories_projects import ProjectFactory
+from tests.factories_tasks import TaskFactory
+from tests.factories_users import UserFactory
+from tests.utils_queries import QueryBudgetMixin, cached_auth
+
+from tasks.models import Task
+from tasks.pagination import KeysetPaginator, InvalidCursor, encode_cursor
+
+
+class KeysetPaginatorTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+        cls.pr = ProjectFactory(user=cls.user)
+        now = timezone.now()
+        TaskFactory.create_batch(7, project=cls.pr)
+        # same timestamp for every row, the id has to break the tie
+        Task.objects.update(created=now)
+        cls.ids = list(Task.objects.order_by('id').values_list('id', flat=True))
+
+    def paginator(self):
+        return KeysetPaginator(Task.objects.all(), ('created', 'id'), 3)
+
+    def test_walk_forward(self):
+        paginator = self.paginator()
+        page = paginator.page()
+        seen = [task.id for task in page]
+        self.assertFalse(page.has_previous())
+        while page.has_next():
+            page = paginator.page(page.next_cursor)
+            seen.extend(task.id for task in page)
+        self.assertEqual(seen, self.ids)
+        self.assertEqual(len(page), 1)
+
+    def test_walk_backward(self):
+        paginator = self.paginator()
+        second = paginator.page(paginator.page().next_cursor)
+        self.assertEqual([task.id for task in second], self.ids[3:6])
+
+        first = paginator.page(second.previous_cursor)
+        self.assertEqual([task.id for task in first], self.ids[:3])
+        self.assertFalse(first.has_previous())
+        self.assertTrue(first.has_next())
+
+    def test_invalid_cursor(self):
+        paginator = self.paginator()
+        with self.assertRaises(InvalidCursor):
+            paginator.page('not-a-cursor')
+        with self.assertRaises(InvalidCursor):
+            paginator.page(encode_cursor('n', ['yesterday', 1]))
+        with self.assertRaises(InvalidCursor):
+            paginator.page(encode_cursor('n', [1]))
+
+
+@cached_auth
+class ListViewPaginationTestCase(QueryBudgetMixin, TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.client = Client()
+        cls.user = UserFactory()
+        cls.pr = ProjectFactory(user=cls.user)
+        TaskFactory.create_batch(60, project=cls.pr)
+        cls.url = reverse('tasks:task_list')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_task_pages(self):
+        self.client.force_login(self.user)
+        response = self.client.get(self.url)
+        page = response.context['page_obj']
+        self.assertEqual(len(response.context['object_list']), 50)
+        self.assertTrue(page.has_next())
+        self.assertContains(response, '?cursor={}'.format(page.next_cursor))
+
+        with self.assertQueryBudget(3) as context:
+            response = self.client.get(self.url, {'cursor': page.next_cursor})
+        self.assertEqual(len(response.context['object_list']), 10)
+        self.assertFalse(response.context['page_obj'].has_next())
+        self.assertNotIn('OFFSET', context.captured_queries[-1]['sql'])
+
+    def test_invalid_cursor_404(self):
+        self.client.force_login(self.user)
+        response = self.client.get(self.url, {'cursor': 'garbage'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_project_pages_ordered_by_title(self):
+        ProjectFactory(user=self.user, title='aaa')
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('tasks:project_list'))
+        self.assertEqual(response.context['object_list'][0].title, 'aaa')
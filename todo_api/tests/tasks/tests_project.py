@@ -1,12 +1,16 @@
 from django.contrib.auth import get_user_model
-from django.test import TestCase, Client
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.test import TestCase, Client, override_settings
 from django.urls import reverse
 from django.utils.translation import activate
 
 from tests.factories_users import UserFactory
 from tests.factories_projects import ProjectFactory
-from tasks.models import Project
-from tasks.forms import ProjectCreateForm
+from tests.factories_tasks import TaskFactory
+from tasks.deletion import delete_batch, purge_project, schedule_deletion
+from tasks.models import Job, Project, Task
+from tasks.forms import ProjectCreateForm, ProjectUpdateForm
 
 
 User = get_user_model()
@@ -58,6 +62,13 @@ class ProjectTestCaseListView(TestCase):
         cls.user2 = UserFactory(is_active=True)
         cls.url = reverse('tasks:project_list')
 
+    def setUp(self):
+        cache.clear()
+
+    def test_get_objects_not_logged_users(self):
+        response = self.client.get(self.url)
+        self.assertRedirects(response, '{}?next={}'.format(reverse('users:login'), self.url))
+
     def test_no_data(self):
         self.client.force_login(self.user)
         response = self.client.get(self.url)
@@ -156,6 +167,57 @@ class ProjectTestCaseCreateView(TestCase):
 
 
 
+class ProjectUniqueTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.client = Client()
+        cls.user = UserFactory()
+        cls.pr = ProjectFactory(user=cls.user, title='Golang', color='primary')
+
+    def test_constraints(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            ProjectFactory(user=self.user, title='Golang')
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            ProjectFactory(user=self.user, color='primary')
+        ProjectFactory(title='Golang', color='primary')
+
+    def test_create_form_checks_both_in_one_query(self):
+        form = ProjectCreateForm(data={'title': 'Golang', 'color': 'primary'}, user=self.user)
+        with self.assertNumQueries(1):
+            self.assertFalse(form.is_valid())
+        self.assertEqual(form.errors['title'], ['You cann\'t use this title again.'])
+        self.assertEqual(form.errors['color'], ['You cann\'t use this color again.'])
+
+    def test_update_form_ignores_own_row(self):
+        other = ProjectFactory(user=self.user, title='Python', color='info')
+        form = ProjectUpdateForm(data={'title': 'Golang', 'color': 'info'}, instance=self.pr, user=self.user)
+        self.assertFalse(form.is_valid())
+        self.assertEqual(list(form.errors), ['color'])
+        form = ProjectUpdateForm(data={'title': 'Golang', 'color': 'dark'}, instance=other, user=self.user)
+        self.assertEqual(list(form.errors), ['title'])
+
+    def test_update_form_checks_in_one_query(self):
+        form = ProjectUpdateForm(data={'title': 'Golang', 'color': 'dark'},
+                                 instance=Project.objects.get(pk=self.pr.pk), user=self.user)
+        with self.assertNumQueries(1):
+            self.assertTrue(form.is_valid())
+
+    def test_concurrent_create_gets_form_errors(self):
+        form = ProjectCreateForm(data={'title': 'Rust', 'color': 'danger'}, user=self.user)
+        self.assertTrue(form.is_valid())
+        ProjectFactory(user=self.user, title='Rust')
+        form.instance.user = self.user
+        with self.assertRaises(IntegrityError):
+            form.save()
+        self.assertEqual(list(form.errors), ['title'])
+
+    def test_view_shows_errors(self):
+        self.client.force_login(self.user)
+        response = self.client.post(reverse('tasks:project_create'), {'title': 'Golang', 'color': 'dark'})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'You cann&#39;t use this title again.')
+        self.assertEqual(Project.objects.filter(user=self.user).count(), 1)
+
 
 class ProjectTestCaseDeleteView(TestCase):
     @classmethod
@@ -183,7 +245,7 @@ class ProjectTestCaseDeleteView(TestCase):
     def test_update_view_user_not_logged(self):
         response = self.client.post(self.url, self.form_data)
         self.assertEqual(response.status_code, 302)
-        self.assertRedirects(response, '/en/users/login/?next=/en/project-update/new-title-for-project-2-username_3/', status_code=302,
+        self.assertRedirects(response, '/en/users/login/?next=/en/project-update/{}/'.format(self.pr_slug), status_code=302,
                              target_status_code=200, fetch_redirect_response=True)
 
     def test_update_data_correct_user(self):
@@ -217,7 +279,7 @@ class ProjectTestCaseDeleteView(TestCase):
     def test_delete_view_user_not_logged(self):
         response = self.client.post(self.url)
         self.assertEqual(response.status_code, 302)
-        self.assertRedirects(response, '/en/users/login/?next=/en/project-delete/new-title-for-project-2-username_3', status_code=302,
+        self.assertRedirects(response, '/en/users/login/?next=/en/project-delete/{}'.format(self.pr_slug), status_code=302,
                              target_status_code=200, fetch_redirect_response=True)
 
     def test_delete_view_get_function_with_user(self):
@@ -246,3 +308,56 @@ class ProjectTestCaseDeleteView(TestCase):
         self.assertRedirects(response, reverse('tasks:project_list'),
                              status_code=302, target_status_code=200, fetch_redirect_response=True)
         self.assertEqual(Project.objects.count(), 0)
+
+
+@override_settings(PROJECT_DELETE_BATCH_SIZE=2)
+class ProjectBatchDeletionTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.client = Client()
+        cls.user = UserFactory()
+        cls.pr = ProjectFactory(user=cls.user, title='Golang', color='primary')
+        TaskFactory.create_batch(5, project=cls.pr)
+        cls.url = reverse('tasks:project_delete', args=[cls.pr.slug])
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def test_large_project_is_hidden_not_deleted(self):
+        response = self.client.post(self.url)
+        self.assertRedirects(response, reverse('tasks:project_list'))
+        project = Project.objects.get(pk=self.pr.pk)
+        self.assertTrue(project.deleting)
+        self.assertIsNone(project.slug)
+        self.assertEqual(Task.objects.filter(project=project).count(), 5)
+        self.assertEqual(Job.objects.get().name, 'delete_project')
+
+        response = self.client.get(reverse('tasks:project_list'))
+        self.assertContains(response, 'being deleted, 5 tasks left')
+        self.assertNotContains(response, self.url)
+        response = self.client.get(reverse('tasks:task_list'))
+        self.assertEqual(len(response.context['object_list']), 0)
+        self.assertEqual(self.client.get(reverse('tasks:api_task_list')).json()['results'], [])
+        self.assertEqual(self.client.get(reverse('tasks:api_project_list')).json()['results'], [])
+
+    def test_title_and_color_are_free_again(self):
+        self.client.post(self.url)
+        self.client.post(reverse('tasks:project_create'), {'title': 'Golang', 'color': 'primary'})
+        self.assertEqual(Project.objects.filter(user=self.user, title='Golang').count(), 2)
+
+    def test_batches(self):
+        project = Project.objects.get(pk=self.pr.pk)
+        schedule_deletion(project)
+        self.assertEqual(delete_batch(project), 2)
+        self.assertEqual(Project.objects.get(pk=self.pr.pk).task_count, 3)
+        self.assertEqual(purge_project(project), 3)
+        self.assertFalse(Project.objects.filter(pk=self.pr.pk).exists())
+        self.assertFalse(Task.objects.exists())
+
+    def test_small_project_is_deleted_right_away(self):
+        project = ProjectFactory(user=self.user)
+        TaskFactory.create_batch(2, project=project)
+        self.client.post(reverse('tasks:project_delete', args=[project.slug]))
+        self.assertFalse(Project.objects.filter(pk=project.pk).exists())
+        self.assertEqual(Task.objects.count(), 5)
@@ -0,0 +1,66 @@
+from django.core.cache import cache
+from django.test import TestCase, Client
+from django.urls import reverse
+
+from tests.factories_projects import ProjectFactory
+from tests.factories_tasks import TaskFactory
+from tests.factories_users import UserFactory
+from tests.utils_queries import QueryBudgetMixin, cached_auth
+
+
+# user + ETag aggregate + list query, the session comes from the cache
+LIST_VIEW_QUERY_BUDGET = 3
+
+
+@cached_auth
+class ProjectListViewQueriesTestCase(QueryBudgetMixin, TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.client = Client()
+        cls.user = UserFactory(is_active=True)
+        cls.url = reverse('tasks:project_list')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_budget_one_project(self):
+        ProjectFactory(user=self.user)
+        self.client.force_login(self.user)
+        with self.assertQueryBudget(LIST_VIEW_QUERY_BUDGET):
+            response = self.client.get(self.url)
+        self.assertEqual(len(response.context['object_list']), 1)
+
+    def test_budget_does_not_grow_with_projects(self):
+        ProjectFactory.create_batch(20, user=self.user)
+        self.client.force_login(self.user)
+        with self.assertQueryBudget(LIST_VIEW_QUERY_BUDGET):
+            response = self.client.get(self.url)
+        self.assertEqual(len(response.context['object_list']), 20)
+
+
+@cached_auth
+class TaskListViewQueriesTestCase(QueryBudgetMixin, TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.client = Client()
+        cls.user = UserFactory(is_active=True)
+        cls.pr = ProjectFactory(user=cls.user)
+        cls.url = reverse('tasks:task_list')
+
+    def test_budget_one_task(self):
+        TaskFactory(project=self.pr)
+        self.client.force_login(self.user)
+        with self.assertQueryBudget(LIST_VIEW_QUERY_BUDGET):
+            response = self.client.get(self.url)
+        self.assertEqual(len(response.context['object_list']), 1)
+
+    def test_budget_does_not_grow_with_tasks(self):
+        TaskFactory.create_batch(20, project=self.pr)
+        self.client.force_login(self.user)
+        with self.assertQueryBudget(LIST_VIEW_QUERY_BUDGET):
+            response = self.client.get(self.url)
+            for task in response.context['object_list']:
+                str(task.project)
+        self.assertEqual(len(response.context['object_list']), 20)
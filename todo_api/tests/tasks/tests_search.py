@@ -0,0 +1,101 @@
+from django.db import connection
+from django.test import TestCase, Client
+from django.urls import reverse
+
+from tests.factories_projects import ProjectFactory
+from tests.factories_tasks import TaskFactory
+from tests.factories_users import UserFactory
+
+from tasks.models import Task
+from tasks.checks import check_search_index
+from tasks.search import missing_objects, search_tasks
+
+
+class TaskSearchTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+        cls.pr = ProjectFactory(user=cls.user)
+        cls.title_match = TaskFactory(project=cls.pr, title='Deploy release', description='ship it')
+        cls.description_match = TaskFactory(project=cls.pr, title='Friday chores',
+                                            description='deploy the release to staging')
+        cls.other = TaskFactory(project=cls.pr, title='Buy milk', description='')
+        cls.foreign = TaskFactory(project=ProjectFactory(), title='Deploy release', description='')
+
+    def test_ranked_and_scoped_to_user(self):
+        page = search_tasks(self.user, 'deploy release')
+        self.assertEqual([task.pk for task in page], [self.title_match.pk, self.description_match.pk])
+        self.assertFalse(page.has_other_pages())
+
+    def test_prefix_match(self):
+        page = search_tasks(self.user, 'mil')
+        self.assertEqual([task.pk for task in page], [self.other.pk])
+
+    def test_index_follows_updates_and_deletes(self):
+        Task.objects.filter(pk=self.other.pk).update(title='Buy bread')
+        self.assertEqual(len(search_tasks(self.user, 'milk')), 0)
+        self.assertEqual(len(search_tasks(self.user, 'bread')), 1)
+        Task.objects.get(pk=self.other.pk).delete()
+        self.assertEqual(len(search_tasks(self.user, 'bread')), 0)
+
+    def test_operators_are_not_interpreted(self):
+        self.assertEqual(len(search_tasks(self.user, 'deploy" (release* -')), 2)
+        self.assertEqual(len(search_tasks(self.user, '*** ')), 0)
+
+    def test_cursor_pages(self):
+        for n in range(4):
+            TaskFactory(project=self.pr, title=f'Deploy hotfix {n}')
+        first = search_tasks(self.user, 'deploy', per_page=3)
+        second = search_tasks(self.user, 'deploy', first.next_cursor, per_page=3)
+        self.assertFalse(second.has_next())
+        back = search_tasks(self.user, 'deploy', second.previous_cursor, per_page=3)
+        self.assertEqual([task.pk for task in back], [task.pk for task in first])
+        seen = [task.pk for task in first] + [task.pk for task in second]
+        self.assertEqual(len(seen), 6)
+        self.assertEqual(len(set(seen)), 6)
+
+
+class TaskSearchViewTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.client = Client()
+        cls.user = UserFactory()
+        cls.task = TaskFactory(project=ProjectFactory(user=cls.user), title='Write search view')
+        cls.url = reverse('tasks:task_search')
+
+    def test_login_required(self):
+        response = self.client.get(self.url, {'q': 'search'})
+        self.assertEqual(response.status_code, 302)
+
+    def test_search(self):
+        self.client.force_login(self.user)
+        response = self.client.get(self.url, {'q': 'search'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.context['object_list']), [self.task])
+
+    def test_empty_query(self):
+        self.client.force_login(self.user)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.context['object_list']), [])
+
+    def test_invalid_cursor(self):
+        self.client.force_login(self.user)
+        response = self.client.get(self.url, {'q': 'search', 'cursor': 'nope'})
+        self.assertEqual(response.status_code, 404)
+
+
+class SearchIndexCheckTestCase(TestCase):
+
+    def test_installed_by_migrations(self):
+        self.assertEqual(missing_objects(connection), [])
+        self.assertEqual(check_search_index(), [])
+
+    def test_missing_trigger(self):
+        trigger = {'sqlite': 'tasks_task_fts_update', 'postgresql': 'tasks_task_search_vector'}[connection.vendor]
+        with connection.cursor() as cursor:
+            cursor.execute(f'DROP TRIGGER {trigger}' + (' ON tasks_task' if connection.vendor == 'postgresql' else ''))
+        self.assertEqual(missing_objects(connection), [trigger])
+        self.assertEqual([error.id for error in check_search_index()], ['tasks.E001'])
@@ -35,6 +35,36 @@ class TastTestCase(TestCase):
         max_length = self.task._meta.get_field('title').max_length
         self.assertEquals(max_length, 255)
 
+    def test_owner_is_project_user(self):
+        self.assertEqual(self.task.owner, self.user)
+
+    def test_owner_follows_task_project(self):
+        user2 = UserFactory()
+        task = Task.objects.get(pk=self.task.pk)
+        task.project = ProjectFactory(user=user2)
+        task.save()
+        self.assertEqual(Task.objects.get(pk=self.task.pk).owner, user2)
+
+    def test_owner_follows_project_user(self):
+        user2 = UserFactory()
+        pr = Project.objects.get(pk=self.pr.pk)
+        pr.user = user2
+        pr.save()
+        self.assertEqual(Task.objects.get(pk=self.task.pk).owner, user2)
+
+    def test_save_queries(self):
+        pr = Project.objects.get(pk=self.pr.pk)
+        # the owner comes from the project, the username is read for the slug
+        with self.assertNumQueries(4):
+            Task.objects.create(project=pr, title='task2')
+        task = Task.objects.get(pk=self.task.pk)
+        with self.assertNumQueries(1):
+            task.save()
+        with self.assertNumQueries(3):
+            task.title = 'renamed'
+            task.save()
+        self.assertEqual(task.slug, 'renamed-user1')
+
 
 class TaskListViewTestCase(TestCase):
     @classmethod
@@ -0,0 +1,72 @@
+from django.core.cache import cache
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+
+from tests.factories_users import UserFactory, TEST_USER_PASSWORD
+from tests.utils_queries import cached_auth
+
+from users.checks import check_user_cache
+from users.models import User
+
+
+@cached_auth
+class CachedAuthenticationMiddlewareTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.client = Client()
+        cls.user = UserFactory(email='cached@gmail.com')
+        cls.url = reverse('tasks:base_view')
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+        self.client.get(self.url)
+
+    def current_user(self):
+        return self.client.get(self.url).wsgi_request.user
+
+    def test_authenticated_page_view_without_queries(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(self.current_user(), self.user)
+
+    def test_profile_change_is_visible(self):
+        user = User.objects.get(pk=self.user.pk)
+        user.username = 'renamed'
+        user.save()
+        self.assertEqual(self.current_user().username, 'renamed')
+
+    def test_password_change_logs_out_other_sessions(self):
+        user = User.objects.get(pk=self.user.pk)
+        user.set_password('new password')
+        user.save()
+        self.assertFalse(self.current_user().is_authenticated)
+
+    def test_deactivation_logs_out(self):
+        user = User.objects.get(pk=self.user.pk)
+        user.is_active = False
+        user.save()
+        self.assertFalse(self.current_user().is_authenticated)
+
+    def test_queryset_deactivation_logs_out(self):
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        self.assertFalse(self.current_user().is_authenticated)
+
+    def test_needs_shared_cache(self):
+        self.assertEqual([error.id for error in check_user_cache()], ['users.E002'])
+        with override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+                                                   'LOCATION': 'todo_api_cache'}}):
+            self.assertEqual(check_user_cache(), [])
+
+    def test_deleted_user_logged_out(self):
+        User.objects.filter(pk=self.user.pk).delete()
+        self.assertFalse(self.current_user().is_authenticated)
+
+    def test_logout(self):
+        self.client.get(reverse('users:logout'))
+        self.assertFalse(self.current_user().is_authenticated)
+
+    def test_login_after_logout(self):
+        self.client.logout()
+        self.client.post(reverse('users:login'), {'username': self.user.email, 'password': TEST_USER_PASSWORD})
+        self.assertEqual(self.current_user(), self.user)
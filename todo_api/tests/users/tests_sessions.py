@@ -0,0 +1,61 @@
+from io import StringIO
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from tests.factories_users import UserFactory
+
+from users.checks import check_session_cache
+
+
+def session_queries(context):
+    return [query['sql'] for query in context.captured_queries if 'django_session' in query['sql']]
+
+
+class SessionProfileTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+
+    def setUp(self):
+        cache.clear()
+
+    def test_page_views_skip_session_table(self):
+        for profile in ('cached_db', 'signed_cookies'):
+            with self.subTest(profile=profile), override_settings(SESSION_ENGINE=settings.SESSION_PROFILES[profile]):
+                client = Client()
+                client.force_login(self.user)
+                with CaptureQueriesContext(connection) as context:
+                    client.get(reverse('tasks:project_list'))
+                    client.get(reverse('tasks:task_list'))
+                self.assertEqual(session_queries(context), [])
+
+    @override_settings(SESSION_ENGINE=settings.SESSION_PROFILES['cached_db'])
+    def test_success_message_does_not_write_session(self):
+        client = Client()
+        client.force_login(self.user)
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(reverse('tasks:project_create'), {'title': 'Golang', 'color': 'primary'},
+                                   follow=True)
+        self.assertContains(response, 'Success: Project was created.')
+        self.assertEqual(session_queries(context), [])
+
+    def test_bench_sessions_command(self):
+        out = StringIO()
+        call_command('bench_sessions', requests=1, stdout=out)
+        for profile in settings.SESSION_PROFILES:
+            self.assertIn(profile, out.getvalue())
+
+    def test_cached_db_needs_shared_cache(self):
+        self.assertEqual(check_session_cache(), [])
+        with override_settings(SESSION_ENGINE=settings.SESSION_PROFILES['cached_db']):
+            self.assertEqual([error.id for error in check_session_cache()], ['users.E001'])
+            with override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+                                                       'LOCATION': 'todo_api_cache'}}):
+                self.assertEqual(check_session_cache(), [])
@@ -0,0 +1,94 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+from django.utils.crypto import pbkdf2
+
+from tests.factories_users import UserFactory, TEST_USER_PASSWORD
+
+from users import throttling
+
+
+@override_settings(LOGIN_THROTTLE_WINDOW=60, LOGIN_THROTTLE_IP_LIMIT=5,
+                   LOGIN_THROTTLE_EMAIL_LIMIT=3, LOGIN_THROTTLE_LOCKOUT=600)
+class ThrottlingTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_email_lockout(self):
+        for i in range(3):
+            self.assertFalse(throttling.register_failure('1.1.1.1', 'a@b.com', now=1000 + i))
+        self.assertEqual(throttling.locked_for('2.2.2.2', 'a@b.com', now=1003), 0)
+        self.assertTrue(throttling.register_failure('2.2.2.2', 'A@b.com ', now=1004))
+        self.assertEqual(throttling.locked_for('3.3.3.3', 'a@b.com', now=1005), 599)
+        self.assertEqual(throttling.locked_for('3.3.3.3', 'other@b.com', now=1005), 0)
+        self.assertEqual(throttling.locked_for('3.3.3.3', 'a@b.com', now=1605), 0)
+
+    def test_ip_lockout(self):
+        for i in range(6):
+            throttling.register_failure('1.1.1.1', f'user{i}@b.com', now=1000)
+        self.assertTrue(throttling.locked_for('1.1.1.1', 'new@b.com', now=1001))
+
+    def test_window_slides(self):
+        # 3 failures early in the previous window weigh little 50s into the next one
+        for i in range(3):
+            throttling.register_failure('1.1.1.1', 'a@b.com', now=960)
+        self.assertFalse(throttling.register_failure('1.1.1.1', 'a@b.com', now=1070))
+        self.assertTrue(throttling.register_failure('1.1.1.1', 'a@b.com', now=1020))
+
+    def test_reset(self):
+        for i in range(3):
+            throttling.register_failure('1.1.1.1', 'a@b.com', now=1000)
+        throttling.reset('a@b.com', now=1001)
+        self.assertFalse(throttling.register_failure('1.1.1.1', 'a@b.com', now=1002))
+
+    def test_stats(self):
+        for i in range(4):
+            throttling.register_failure('1.1.1.1', 'a@b.com', now=1000)
+        throttling.locked_for('1.1.1.1', 'a@b.com', now=1001)
+        self.assertEqual(throttling.throttle_stats(), {'failures': 4, 'lockouts': 1, 'blocked': 1})
+
+
+@override_settings(LOGIN_THROTTLE_EMAIL_LIMIT=2)
+class LoginViewThrottlingTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.client = Client()
+        cls.user = UserFactory(email='testing@gmail.com')
+        cls.staff = UserFactory(is_staff=True)
+        cls.url = reverse('users:login')
+
+    def setUp(self):
+        cache.clear()
+
+    def login(self, password):
+        return self.client.post(self.url, {'username': 'testing@gmail.com', 'password': password})
+
+    def test_locked_out_without_query_or_hash(self):
+        for i in range(3):
+            self.assertEqual(self.login('wrong').status_code, 200)
+        with mock.patch('django.contrib.auth.hashers.pbkdf2', wraps=pbkdf2) as hashes:
+            with self.assertNumQueries(0):
+                response = self.login(TEST_USER_PASSWORD)
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(hashes.call_count, 0)
+        self.assertTrue(int(response['Retry-After']) > 0)
+        self.assertContains(response, 'Too many login attempts', status_code=429)
+
+    def test_success_resets_failures(self):
+        self.login('wrong')
+        self.login('wrong')
+        self.assertEqual(self.login(TEST_USER_PASSWORD).status_code, 302)
+        self.client.logout()
+        self.login('wrong')
+        self.assertEqual(self.login(TEST_USER_PASSWORD).status_code, 302)
+
+    def test_stats_view_staff_only(self):
+        url = reverse('users:login_throttle_stats')
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(url).status_code, 403)
+        self.client.force_login(self.staff)
+        self.assertEqual(self.client.get(url).json(), {'failures': 0, 'lockouts': 0, 'blocked': 0})
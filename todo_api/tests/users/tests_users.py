@@ -1,10 +1,13 @@
 import sys
 sys.path.append("..")
 
+from unittest import mock
+
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AnonymousUser
 from django.urls import reverse
 from django.test import TestCase, Client
+from django.utils.crypto import pbkdf2
 
 from todo_api.tests.factories_users import UserFactory
 from todo_api.users.forms import CustomAuthenticationForm, CustomUserCreationForm
@@ -92,6 +95,52 @@ class UserAuthenticationFormTestCase(TestCase):
         form = self.form(data={'username':'testing@gmail.com', 'password':12121212})
         self.assertTrue(form.is_valid())
 
+    def test_form_unknown_email(self):
+        form = self.form(data={'username': 'nobody@gmail.com', 'password': 12121212})
+        self.assertFalse(form.is_valid())
+        self.assertEquals(form.errors['username'][0], 'User with such email doesn\'t exists.')
+
+    def test_form_inactive_user(self):
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        form = self.form(data={'username': 'testing@gmail.com', 'password': 12121212})
+        self.assertFalse(form.is_valid())
+        self.assertEquals(form.non_field_errors()[0], form.error_messages['inactive'])
+
+
+class LoginCostTestCase(TestCase):
+    """One user lookup and one hasher call per login attempt."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.client = Client()
+        cls.user = UserFactory(username='testing', email='testing@gmail.com', password=12121212)
+        cls.url = reverse('users:login')
+
+    def count_hashes(self):
+        return mock.patch('django.contrib.auth.hashers.pbkdf2', wraps=pbkdf2)
+
+    def attempt(self, email, password):
+        form = CustomAuthenticationForm(data={'username': email, 'password': password})
+        with self.count_hashes() as hashes, self.assertNumQueries(1):
+            valid = form.is_valid()
+        return valid, hashes.call_count
+
+    def test_valid_login(self):
+        self.assertEqual(self.attempt('testing@gmail.com', 12121212), (True, 1))
+
+    def test_wrong_password(self):
+        self.assertEqual(self.attempt('testing@gmail.com', 'wrong'), (False, 1))
+
+    def test_unknown_email(self):
+        self.assertEqual(self.attempt('nobody@gmail.com', 12121212), (False, 1))
+
+    def test_login_view(self):
+        with self.count_hashes() as hashes:
+            response = self.client.post(self.url, {'username': 'testing@gmail.com', 'password': 12121212})
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(hashes.call_count, 1)
+        self.assertEqual(int(self.client.session['_auth_user_id']), self.user.pk)
+
 
 class UserCreationFormTestCase(TestCase):
 
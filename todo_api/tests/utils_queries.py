@@ -0,0 +1,29 @@
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+
+def cached_auth(decorated):
+    """Session and request.user read from the cache, as with settings.production."""
+    middleware = ['users.middleware.CachedAuthenticationMiddleware'
+                  if name == 'django.contrib.auth.middleware.AuthenticationMiddleware' else name
+                  for name in settings.MIDDLEWARE]
+    return override_settings(SESSION_ENGINE='django.contrib.sessions.backends.cached_db',
+                             MIDDLEWARE=middleware)(decorated)
+
+
+class QueryBudgetMixin:
+
+    @contextmanager
+    def assertQueryBudget(self, budget):
+        with CaptureQueriesContext(connection) as context:
+            yield context
+        executed = len(context.captured_queries)
+        if executed > budget:
+            queries = '\n'.join(
+                '{}. {}'.format(i, query['sql']) for i, query in enumerate(context.captured_queries, start=1)
+            )
+            self.fail('{} queries executed, budget is {}.\n{}'.format(executed, budget, queries))
@@ -0,0 +1,34 @@
+from django.conf import settings
+from django.core import checks
+
+
+LOCAL_CACHE_BACKENDS = ('django.core.cache.backends.locmem.LocMemCache',)
+
+
+def _local_cache():
+    # each process has a cache of its own, what one drops the others keep
+    return settings.CACHES.get('default', {}).get('BACKEND') in LOCAL_CACHE_BACKENDS
+
+
+@checks.register(checks.Tags.caches)
+def check_session_cache(app_configs=None, **kwargs):
+    if settings.SESSION_ENGINE == 'django.contrib.sessions.backends.cached_db' and _local_cache():
+        return [checks.Error(
+            'cached_db sessions need a cache shared by all processes.',
+            hint='A logout only drops the session from the cache of the process that served it. '
+                 'Configure a shared default cache or another SESSION_ENGINE.',
+            id='users.E001',
+        )]
+    return []
+
+
+@checks.register(checks.Tags.caches)
+def check_user_cache(app_configs=None, **kwargs):
+    if 'users.middleware.CachedAuthenticationMiddleware' in settings.MIDDLEWARE and _local_cache():
+        return [checks.Error(
+            'CachedAuthenticationMiddleware needs a cache shared by all processes.',
+            hint='A password change or deactivation only drops the user from the cache of the process '
+                 'that saved it. Configure a shared default cache or use AuthenticationMiddleware.',
+            id='users.E002',
+        )]
+    return []
@@ -1,5 +1,6 @@
 from django import forms
 from django.contrib.auth import get_user_model
+from django.contrib.auth.signals import user_login_failed
 from django.contrib.auth.forms import AuthenticationForm
 from django.contrib.auth.forms import UserCreationForm
 from django.core.validators import validate_email
@@ -7,6 +8,8 @@ from django.core.validators import validate_email
 
 User = get_user_model()
 
+MODEL_BACKEND = 'django.contrib.auth.backends.ModelBackend'
+
 
 class CustomAuthenticationForm(AuthenticationForm):
     password = forms.CharField(label='Password', widget=forms.PasswordInput())
@@ -21,23 +24,37 @@ class CustomAuthenticationForm(AuthenticationForm):
             raise forms.ValidationError('Missed the @ symbol in the email address.')
         if '.' not in email:
             raise forms.ValidationError('Missed the . symbol in the email address.')
-        if not User.objects.filter(email=email).exists():
-            raise forms.ValidationError('User with such email doesn\'t exists.')
         try:
             mt = validate_email(email)
         except:
             raise forms.ValidationError('Incorrect email.')
         return email
 
-    def clean_password(self):
+    def clean(self):
+        """
+        One user lookup and one password hash per attempt, instead of
+        ``AuthenticationForm.clean`` authenticating again after the field checks.
+        """
         email = self.cleaned_data.get('username')
-        password = self.cleaned_data['password']
-        user = User.objects.get(email=email)
-        if not user:
-            raise forms.ValidationError('Invalid password for this user.')
+        password = self.cleaned_data.get('password')
+        if email is None or not password:
+            return self.cleaned_data
+
+        user = User._default_manager.filter(email=email).first()
+        if user is None:
+            # hash anyway so a missing account doesn't answer faster (like ModelBackend)
+            User().set_password(password)
+            self.add_error('username', 'User with such email doesn\'t exists.')
         elif not user.check_password(password):
-            raise forms.ValidationError('Invalid password.')
-        return password
+            self.add_error('password', 'Invalid password.')
+        else:
+            user.backend = MODEL_BACKEND
+            self.user_cache = user
+            self.confirm_login_allowed(user)
+            return self.cleaned_data
+
+        user_login_failed.send(sender=__name__, credentials={'username': email}, request=self.request)
+        return self.cleaned_data
 
 
 class CustomUserCreationForm(forms.ModelForm):
@@ -0,0 +1,54 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+
+User = get_user_model()
+
+URLS = ['tasks:base_view', 'tasks:project_list', 'tasks:task_list']
+
+
+class Command(BaseCommand):
+    help = 'Count the queries of authenticated page views under every session profile.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help='Email of the user to log in as (default: first user).')
+        parser.add_argument('--requests', type=int, default=20)
+
+    def handle(self, *args, **options):
+        users = User.objects.order_by('id')
+        if options['user']:
+            users = users.filter(email=options['user'])
+        user = users.first()
+        if user is None:
+            raise CommandError('No user to log in as.')
+
+        self.stdout.write(f'{options["requests"]} requests per page, {user.email}')
+        self.stdout.write(f'{"profile":<15} {"page":<20} {"queries":>8} {"session":>8} {"mean ms":>9}')
+        for profile, engine in settings.SESSION_PROFILES.items():
+            with override_settings(SESSION_ENGINE=engine, ALLOWED_HOSTS=settings.ALLOWED_HOSTS + ['testserver']):
+                for name, queries, session_queries, timings in self.measure(user, options['requests']):
+                    self.stdout.write('{:<15} {:<20} {:>8.1f} {:>8.1f} {:>9.3f}'.format(
+                        profile, name, queries, session_queries, statistics.mean(timings)))
+
+    def measure(self, user, requests):
+        client = Client()
+        client.force_login(user)
+        for name in URLS:
+            url = reverse(name)
+            client.get(url)  # warm up caches
+            timings = []
+            with CaptureQueriesContext(connection) as context:
+                for _ in range(requests):
+                    started = time.perf_counter()
+                    client.get(url)
+                    timings.append((time.perf_counter() - started) * 1000)
+            session_queries = sum('django_session' in query['sql'] for query in context.captured_queries)
+            yield name, len(context) / requests, session_queries / requests, timings
@@ -0,0 +1,81 @@
+import time
+
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.utils.crypto import constant_time_compare
+from django.utils.functional import SimpleLazyObject
+
+
+def _version_key(user_id):
+    return f'auth:user:version:{user_id}'
+
+
+def _user_key(user_id, version):
+    return f'auth:user:{user_id}:{version}'
+
+
+def _get_version(user_id):
+    key = _version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, int(time.time() * 1000), None)
+        version = cache.get(key)
+    return version
+
+
+def invalidate_user(user_id):
+    """
+    Drop the cached user. Bumping the version also orphans an entry a request
+    that read the row before the change is about to write.
+    """
+    key = _version_key(user_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, int(time.time() * 1000), None)
+
+
+def get_cached_user(request):
+    """
+    ``django.contrib.auth.get_user`` with the user row cached by id. The
+    session auth hash is still compared on every request, anything unusual
+    (no session, another backend, a hash mismatch) goes through ``get_user``
+    so its checks and session flushing apply unchanged.
+    """
+    session = request.session
+    try:
+        user_id = auth.get_user_model()._meta.pk.to_python(session[auth.SESSION_KEY])
+        backend_path = session[auth.BACKEND_SESSION_KEY]
+    except KeyError:
+        return AnonymousUser()
+    session_hash = session.get(auth.HASH_SESSION_KEY)
+    if backend_path not in settings.AUTHENTICATION_BACKENDS or not session_hash:
+        return auth.get_user(request)
+
+    key = _user_key(user_id, _get_version(user_id))
+    user = cache.get(key)
+    if user is None:
+        user = auth.get_user(request)
+        if user.is_authenticated:
+            cache.set(key, user, getattr(settings, 'AUTH_USER_CACHE_TIMEOUT', 60 * 5))
+        return user
+    if constant_time_compare(session_hash, user.get_session_auth_hash()):
+        return user
+    return auth.get_user(request)
+
+
+def get_user(request):
+    if not hasattr(request, '_cached_user'):
+        request._cached_user = get_cached_user(request)
+    return request._cached_user
+
+
+class CachedAuthenticationMiddleware(AuthenticationMiddleware):
+    """``AuthenticationMiddleware`` resolving ``request.user`` from the cache."""
+
+    def process_request(self, request):
+        super(CachedAuthenticationMiddleware, self).process_request(request)
+        request.user = SimpleLazyObject(lambda: get_user(request))
@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from django.core.validators import RegexValidator
 from django.contrib.auth.models import BaseUserManager, AbstractBaseUser
 from django.utils.translation import ugettext_lazy as _
@@ -8,7 +8,23 @@ from django.contrib.auth.models import PermissionsMixin
 USERNAME_REGEX = '^[a-zA-Z0-9.+-]*$'
 
 
-class UserManager(BaseUserManager):
+class UserQuerySet(models.QuerySet):
+
+    def update(self, **kwargs):
+        # no post_save is sent, so the cached users (users.middleware) are
+        # dropped here, e.g. after update(is_active=False); imported late as
+        # django.contrib.auth.middleware needs the User model
+        from .middleware import invalidate_user
+
+        with transaction.atomic(using=self.db):
+            pks = list(self.values_list('pk', flat=True))
+            rows = super(UserQuerySet, self).update(**kwargs)
+        for pk in pks:
+            invalidate_user(pk)
+        return rows
+
+
+class UserManager(BaseUserManager.from_queryset(UserQuerySet)):
 
     def _create_user(self, email, password, **extra_fields):
         if not email:
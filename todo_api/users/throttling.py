@@ -0,0 +1,115 @@
+"""
+Login throttling kept in the cache, checked before the login form touches the
+database or hashes a password.
+
+Failed attempts are counted per client IP and per email in a sliding window
+(the current fixed window plus the previous one weighted by how much of it
+still overlaps). Going over a limit locks that IP or email out for
+``LOGIN_THROTTLE_LOCKOUT`` seconds.
+"""
+import hashlib
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+IP = 'ip'
+EMAIL = 'email'
+
+STATS_KEYS = {
+    'failures': 'login:stats:failures',
+    'lockouts': 'login:stats:lockouts',
+    'blocked': 'login:stats:blocked',
+}
+
+
+def _incr(key, timeout=None):
+    try:
+        return cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, timeout)
+        return cache.incr(key)
+
+
+def _limits():
+    return {
+        IP: getattr(settings, 'LOGIN_THROTTLE_IP_LIMIT', 20),
+        EMAIL: getattr(settings, 'LOGIN_THROTTLE_EMAIL_LIMIT', 5),
+    }
+
+
+def _window():
+    return getattr(settings, 'LOGIN_THROTTLE_WINDOW', 60 * 5)
+
+
+def _lockout():
+    return getattr(settings, 'LOGIN_THROTTLE_LOCKOUT', 60 * 15)
+
+
+def _identities(ip, email):
+    email = (email or '').strip().lower()
+    identities = [(IP, ip)] if ip else []
+    if email:
+        identities.append((EMAIL, hashlib.md5(email.encode()).hexdigest()))
+    return identities
+
+
+def _lockout_key(scope, identity):
+    return f'login:lockout:{scope}:{identity}'
+
+
+def _bucket_key(scope, identity, bucket):
+    return f'login:attempts:{scope}:{identity}:{bucket}'
+
+
+def client_ip(request):
+    # Behind a proxy, REMOTE_ADDR has to be set from X-Forwarded-For by the proxy setup.
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def locked_for(ip, email, now=None):
+    """Return how many seconds the IP or email is still locked out (0 if not)."""
+    now = time.time() if now is None else now
+    keys = [_lockout_key(scope, identity) for scope, identity in _identities(ip, email)]
+    until = max(cache.get_many(keys).values(), default=0)
+    if until <= now:
+        return 0
+    _incr(STATS_KEYS['blocked'])
+    return math.ceil(until - now)
+
+
+def register_failure(ip, email, now=None):
+    """Count a failed attempt; return True if it locked the IP or email out."""
+    now = time.time() if now is None else now
+    window = _window()
+    bucket, elapsed = divmod(now, window)
+    bucket = int(bucket)
+    limits = _limits()
+    _incr(STATS_KEYS['failures'])
+
+    locked = False
+    for scope, identity in _identities(ip, email):
+        current = _incr(_bucket_key(scope, identity, bucket), window * 2)
+        previous = cache.get(_bucket_key(scope, identity, bucket - 1), 0)
+        if previous * (1 - elapsed / window) + current > limits[scope]:
+            cache.set(_lockout_key(scope, identity), now + _lockout(), _lockout())
+            _incr(STATS_KEYS['lockouts'])
+            locked = True
+    return locked
+
+
+def reset(email, now=None):
+    """Forget the email's failures after a successful login; the IP keeps its history."""
+    now = time.time() if now is None else now
+    bucket = int(now // _window())
+    for scope, identity in _identities(None, email):
+        cache.delete_many([_lockout_key(scope, identity),
+                           _bucket_key(scope, identity, bucket),
+                           _bucket_key(scope, identity, bucket - 1)])
+
+
+def throttle_stats():
+    values = cache.get_many(STATS_KEYS.values())
+    return {name: values.get(key, 0) for name, key in STATS_KEYS.items()}
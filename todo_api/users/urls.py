@@ -1,5 +1,5 @@
 from django.urls import path, reverse_lazy
-from .views import CustomLoginView, CustomLogoutView, CustomRegistrationView
+from .views import CustomLoginView, CustomLogoutView, CustomRegistrationView, LoginThrottleStatsView
 
 app_name = 'users'
 
@@ -7,4 +7,5 @@ urlpatterns = [
     path('login/', CustomLoginView.as_view(), name='login'),
     path('logout/', CustomLogoutView.as_view(next_page = reverse_lazy('tasks:base_view')), name='logout'),
     path('registration/', CustomRegistrationView.as_view(), name='registration'),
+    path('login-throttle-stats/', LoginThrottleStatsView.as_view(), name='login_throttle_stats'),
 ]
\ No newline at end of file
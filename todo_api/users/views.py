@@ -1,11 +1,15 @@
+import math
+
 from django.shortcuts import render
-from django.http import HttpResponseRedirect
+from django.http import HttpResponseRedirect, JsonResponse
 from django.views.generic import View, CreateView
 from django.contrib import messages
+from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.contrib.auth.views import LogoutView, LoginView
 from django.contrib.messages.views import SuccessMessageMixin
 from django.urls import reverse_lazy
 
+from . import throttling
 from .forms import CustomAuthenticationForm, CustomUserCreationForm
 
 class CustomLogoutView(LogoutView):
@@ -16,11 +20,40 @@ class CustomLogoutView(LogoutView):
 
 
 class CustomLoginView(SuccessMessageMixin, LoginView):
-    form = CustomAuthenticationForm
+    form_class = CustomAuthenticationForm
     template_name = 'users/login.html'
     success_message = 'Success: You were successfully logged in.'
     success_url = reverse_lazy('tours:base_view')
 
+    def post(self, request, *args, **kwargs):
+        # before the form runs: a locked out attempt costs no query and no hash
+        retry_after = throttling.locked_for(throttling.client_ip(request), request.POST.get('username'))
+        if retry_after:
+            context = self.get_context_data(
+                form=self.form_class(request=request),
+                throttled=f'Too many login attempts. Try again in {math.ceil(retry_after / 60)} min.')
+            response = self.render_to_response(context, status=429)
+            response['Retry-After'] = str(retry_after)
+            return response
+        return super(CustomLoginView, self).post(request, *args, **kwargs)
+
+    def form_valid(self, form):
+        throttling.reset(form.get_user().email)
+        return super(CustomLoginView, self).form_valid(form)
+
+    def form_invalid(self, form):
+        throttling.register_failure(throttling.client_ip(self.request), form.data.get('username'))
+        return super(CustomLoginView, self).form_invalid(form)
+
+
+class LoginThrottleStatsView(LoginRequiredMixin, UserPassesTestMixin, View):
+
+    def get(self, request, *args, **kwargs):
+        return JsonResponse(throttling.throttle_stats())
+
+    def test_func(self):
+        return self.request.user.is_staff
+
 
 class CustomRegistrationView(CreateView):
     template_name = 'users/registration.html'